@@ -0,0 +1,93 @@
+# benchmarks/bench_coldstart.py
+#
+# Cold-start latency of each model artifact format: every run is a new Python
+# interpreter that imports the loader, loads the artifact and scores one row,
+# as an autoscaled worker would. Run from the project root:
+#     python -m benchmarks.bench_coldstart --runs 5
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from src.data_loading import TARGET_COLUMN
+from src.data_preprocessing import preprocess_data
+from src.model_training import train_models
+from src.utils import MODEL_FORMATS, save_model
+
+# Runs in the fresh interpreter; prints the phase timings as JSON
+CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from src.utils import load_model
+imported = time.perf_counter()
+model = load_model(sys.argv[1], use_cache=False)
+loaded = time.perf_counter()
+row = json.loads(sys.argv[2])
+if hasattr(model, 'predict_one'):
+    prediction = model.predict_one(row)
+else:
+    import pandas as pd
+    prediction = model.predict(pd.DataFrame([row]))[0]
+predicted = time.perf_counter()
+print(json.dumps({
+    'import_s': imported - start,
+    'load_s': loaded - imported,
+    'first_prediction_s': predicted - loaded,
+    'prediction': float(prediction),
+    'sklearn_imported': 'sklearn' in sys.modules,
+    'pandas_imported': 'pandas' in sys.modules
+}))
+"""
+
+def cold_start(path: str, row: dict) -> dict:
+    """
+    Run one cold start in a new interpreter.
+    """
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-W', 'ignore', '-c', CHILD_SCRIPT, path, json.dumps(row)],
+                            capture_output=True, text=True, check=True, cwd=os.getcwd()).stdout
+    stats = json.loads(output.strip().splitlines()[-1])
+    stats['process_s'] = time.perf_counter() - start
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark of the model artifact formats.")
+    parser.add_argument('--data', default='data/boston_housing.csv')
+    parser.add_argument('--runs', type=int, default=5, help="Cold starts per format; medians are reported.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    df = pd.read_csv(args.data)
+    X, y, preprocessor = preprocess_data(df)
+    X_train, X_test, y_train, _ = train_test_split(X, y, test_size=0.2, random_state=42)
+    model = train_models(X_train, y_train, preprocessor)['Decision Tree']
+    row = {name: float(value) for name, value in df.drop(columns=TARGET_COLUMN).iloc[0].items()}
+
+    print(f"{'format':<10}{'size KB':>9}{'import ms':>11}{'load ms':>10}{'1st pred ms':>13}"
+          f"{'process ms':>12}{'sklearn':>9}{'pandas':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for model_format in MODEL_FORMATS:
+            path = os.path.join(tmp, f"model_{model_format}.bin")
+            try:
+                save_model(model, path, model_format=model_format)
+            except ImportError as e:
+                print(f"{model_format:<10}skipped: {e}")
+                continue
+            runs = [cold_start(path, row) for _ in range(args.runs)]
+            median = {key: statistics.median(run[key] for run in runs)
+                      for key in ('import_s', 'load_s', 'first_prediction_s', 'process_s')}
+            print(f"{model_format:<10}{os.path.getsize(path) / 1024:>9.1f}{median['import_s'] * 1e3:>11.1f}"
+                  f"{median['load_s'] * 1e3:>10.1f}{median['first_prediction_s'] * 1e3:>13.1f}"
+                  f"{median['process_s'] * 1e3:>12.1f}{str(runs[0]['sklearn_imported']):>9}"
+                  f"{str(runs[0]['pandas_imported']):>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/bench_compact.py
+#
+# Compare the default 64-bit pipeline with compact mode (float32, downcast
+# integers, categorical chas) on synthetic data: memory of the loaded frame
+# and of the transformed training matrix, peak RSS, fit time and hold-out
+# accuracy. Each mode runs in a fresh process. Run from the project root:
+#     python -m benchmarks.bench_compact --rows 1000000
+
+import argparse
+import logging
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+from benchmarks.bench_pipeline import generate_in_fresh_process
+
+def _run(filepath: str, compact: bool) -> dict:
+    logging.basicConfig(level=logging.WARNING)
+    from sklearn.model_selection import train_test_split
+    from src.data_loading import load_data, BOSTON_DTYPES
+    from src.data_preprocessing import preprocess_data
+    from src.model_evaluation import evaluate_models, iter_test_chunks
+    from src.model_training import train_models
+
+    start = time.perf_counter()
+    df = load_data(filepath, dtype=BOSTON_DTYPES, compact=compact)
+    load_seconds = time.perf_counter() - start
+    frame_mb = df.memory_usage(deep=True).sum() / 2**20
+
+    X, y, preprocessor = preprocess_data(df, compact=compact)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    matrix = preprocessor.fit_transform(X_train)
+    matrix_mb = matrix.nbytes / 2**20
+    del matrix
+
+    start = time.perf_counter()
+    models = train_models(X_train, y_train, preprocessor, n_jobs=1)
+    train_seconds = time.perf_counter() - start
+    metrics = evaluate_models(models, iter_test_chunks(X_test, y_test, chunk_size=1_000_000))
+    return {
+        'load_seconds': load_seconds,
+        'frame_mb': frame_mb,
+        'matrix_mb': matrix_mb,
+        'train_seconds': train_seconds,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KiB on Linux
+        'metrics': metrics
+    }
+
+def run_in_fresh_process(filepath: str, compact: bool) -> dict:
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(_run, (filepath, compact))
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory and accuracy of compact vs. default dtypes.")
+    parser.add_argument('--rows', type=lambda value: int(float(value)), default=1_000_000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    workdir = tempfile.mkdtemp(prefix='bench_compact_')
+    try:
+        filepath = generate_in_fresh_process(os.path.join(workdir, 'data.csv'), args.rows)
+        results = {mode: run_in_fresh_process(filepath, mode == 'compact') for mode in ('default', 'compact')}
+    finally:
+        shutil.rmtree(workdir)
+
+    default, compact = results['default'], results['compact']
+    print(f"{args.rows} synthetic rows")
+    print(f"{'':<16}{'default':>12}{'compact':>12}{'saved':>10}")
+    for key, label in [('frame_mb', 'frame MB'), ('matrix_mb', 'matrix MB'), ('peak_rss_mb', 'peak RSS MB')]:
+        saved = 1 - compact[key] / default[key]
+        print(f"{label:<16}{default[key]:>12.1f}{compact[key]:>12.1f}{saved:>10.0%}")
+    for key, label in [('load_seconds', 'load s'), ('train_seconds', 'train s')]:
+        print(f"{label:<16}{default[key]:>12.2f}{compact[key]:>12.2f}")
+
+    print(f"\n{'model':<20}{'metric':<10}{'default':>12}{'compact':>12}{'difference':>14}")
+    for name, metrics in default['metrics'].items():
+        for metric in ('RMSE', 'R2_Score'):
+            a, b = metrics[metric], compact['metrics'][name][metric]
+            print(f"{name:<20}{metric:<10}{a:>12.5f}{b:>12.5f}{b - a:>14.2e}")
+
+if __name__ == "__main__":
+    main()
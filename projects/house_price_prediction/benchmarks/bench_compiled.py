@@ -0,0 +1,87 @@
+# benchmarks/bench_compiled.py
+#
+# Check that compiled models predict exactly like their sklearn pipelines and
+# compare single-row and batch latency. Run from the project root:
+#     python -m benchmarks.bench_compiled
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from src.data_loading import TARGET_COLUMN
+from src.data_preprocessing import preprocess_data
+from src.model_training import train_models
+from src.compiled_model import CompiledModel, compile_pipeline
+
+def check_parity(name: str, pipeline, compiled: CompiledModel, X: pd.DataFrame) -> None:
+    """
+    Raise AssertionError if the compiled model disagrees with the pipeline.
+    """
+    expected = pipeline.predict(X)
+    matrix = X[compiled.feature_names].to_numpy(dtype=np.float64)
+    np.testing.assert_allclose(compiled.predict(matrix), expected, rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(
+        compiled.predict_columns({column: X[column].to_numpy() for column in compiled.feature_names}),
+        expected, rtol=1e-9, atol=1e-9
+    )
+    row_predictions = [compiled.predict_one(row) for row in X.to_dict(orient='records')]
+    np.testing.assert_allclose(row_predictions, expected, rtol=1e-9, atol=1e-9)
+    print(f"{name}: parity OK on {len(X)} rows")
+
+def time_per_call(func, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+def main():
+    parser = argparse.ArgumentParser(description="Parity check and latency benchmark for compiled models.")
+    parser.add_argument('--data', default='data/boston_housing.csv')
+    parser.add_argument('--repeats', type=int, default=1000)
+    parser.add_argument('--batch-rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    df = pd.read_csv(args.data)
+    X, y, preprocessor = preprocess_data(df)
+    X_train, X_test, y_train, _ = train_test_split(X, y, test_size=0.2, random_state=42)
+    models = train_models(X_train, y_train, preprocessor)
+
+    # Missing values exercise the imputers; unseen categories the ignore path
+    X_check = X_test.copy()
+    X_check['chas'] = X_check['chas'].astype('float64')
+    X_check.iloc[::7, 0] = np.nan
+    X_check.iloc[::11, X_check.columns.get_loc('chas')] = np.nan
+    X_check.iloc[::13, X_check.columns.get_loc('chas')] = 2.0
+
+    row = X_test.iloc[[0]]
+    row_dict = row.iloc[0].to_dict()
+    batch = pd.concat([X_test] * -(-args.batch_rows // len(X_test)), ignore_index=True).iloc[:args.batch_rows]
+
+    compiled_models = {}
+    for name, pipeline in models.items():
+        # Round-trip through the saved artifact so the check covers serialization
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'model.npz')
+            compile_pipeline(pipeline).save(path)
+            compiled_models[name] = CompiledModel.load(path)
+        check_parity(name, pipeline, compiled_models[name], X_check)
+
+    print(f"{'model':<20}{'pipeline row us':>16}{'compiled row us':>16}{'pipeline batch ms':>19}{'compiled batch ms':>19}")
+    for name, pipeline in models.items():
+        compiled = compiled_models[name]
+        matrix = batch[compiled.feature_names].to_numpy(dtype=np.float64)
+        pipeline_row = time_per_call(lambda: pipeline.predict(pd.DataFrame([row_dict])), args.repeats // 10)
+        compiled_row = time_per_call(lambda: compiled.predict_one(row_dict), args.repeats)
+        pipeline_batch = time_per_call(lambda: pipeline.predict(batch), 3)
+        compiled_batch = time_per_call(lambda: compiled.predict(matrix), 3)
+        print(f"{name:<20}{pipeline_row * 1e6:>16.1f}{compiled_row * 1e6:>16.1f}"
+              f"{pipeline_batch * 1e3:>19.1f}{compiled_batch * 1e3:>19.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_load.py
+#
+# Report parse time and peak memory of load_data for inferred vs. declared
+# dtypes, the C vs. pyarrow parser, and cold vs. warm columnar cache loads.
+# Every scenario runs in a fresh process so peak memory is not shared.
+# Run from the project root:
+#     python -m benchmarks.bench_load --rows 1000000
+
+import argparse
+import logging
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+from src.data_loading import load_data, BOSTON_DTYPES
+
+def _measure(filepath: str, options: dict) -> dict:
+    logging.basicConfig(level=logging.WARNING)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = load_data(filepath, **options)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'seconds': seconds,
+        'traced_peak_mb': peak / 2**20,
+        'rss_growth_mb': (rss_after - rss_before) / 1024,  # ru_maxrss is in KiB on Linux
+        'frame_mb': data.memory_usage(deep=True).sum() / 2**20
+    }
+
+def measure_in_fresh_process(filepath: str, options: dict) -> dict:
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(_measure, (filepath, options))
+
+def write_tiled_csv(source: str, rows: int, target: str) -> None:
+    df = pd.read_csv(source)
+    repeats = -(-rows // len(df))
+    pd.concat([df] * repeats, ignore_index=True).iloc[:rows].to_csv(target, index=False)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark load_data parsing and caching.")
+    parser.add_argument('--data', default='data/boston_housing.csv')
+    parser.add_argument('--rows', type=int, default=1_000_000,
+                        help="Tile the dataset to this many rows before loading; 0 uses it as is.")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_load_')
+    try:
+        filepath = args.data
+        if args.rows:
+            filepath = os.path.join(workdir, 'data.csv')
+            write_tiled_csv(args.data, args.rows, filepath)
+        cache_dir = os.path.join(workdir, 'cache')
+
+        scenarios = [
+            ('csv inferred', {}),
+            ('csv schema', {'dtype': BOSTON_DTYPES}),
+            ('csv pyarrow', {'dtype': BOSTON_DTYPES, 'engine': 'pyarrow'}),
+            ('parquet cold', {'dtype': BOSTON_DTYPES, 'cache_dir': cache_dir}),
+            ('parquet warm', {'dtype': BOSTON_DTYPES, 'cache_dir': cache_dir}),
+            ('feather cold', {'dtype': BOSTON_DTYPES, 'cache_dir': cache_dir, 'cache_format': 'feather'}),
+            ('feather warm', {'dtype': BOSTON_DTYPES, 'cache_dir': cache_dir, 'cache_format': 'feather'})
+        ]
+
+        print(f"File: {filepath} ({os.path.getsize(filepath) / 2**20:.1f} MB)")
+        print(f"{'scenario':<14}{'seconds':>10}{'traced MB':>12}{'RSS MB':>10}{'frame MB':>10}")
+        for name, options in scenarios:
+            stats = measure_in_fresh_process(filepath, options)
+            print(f"{name:<14}{stats['seconds']:>10.3f}{stats['traced_peak_mb']:>12.1f}"
+                  f"{stats['rss_growth_mb']:>10.1f}{stats['frame_mb']:>10.1f}")
+    finally:
+        shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
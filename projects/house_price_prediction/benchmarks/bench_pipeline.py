@@ -0,0 +1,160 @@
+# benchmarks/bench_pipeline.py
+#
+# End-to-end benchmark: generate synthetic Boston-schema data at several sizes
+# and run load_data, explore_data, preprocess_data, train_models,
+# evaluate_models and hyperparameter_tuning on each, recording time and memory
+# per stage. Each size runs in a fresh process so peak memory is not shared.
+# Run from the project root:
+#     python -m benchmarks.bench_pipeline --sizes 1e4,1e5,1e6 --output results.json
+#     python -m benchmarks.bench_pipeline --sizes 1e4,1e5,1e6 --baseline results.json
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+STAGES = ('load', 'eda', 'preprocess', 'split', 'train', 'evaluate', 'tune')
+
+# Kept small so the largest sizes finish; the point is how each stage scales
+TUNING_GRID = {
+    'regressor__max_depth': [5, 10],
+    'regressor__min_samples_leaf': [1, 4]
+}
+
+def _run_pipeline(filepath: str, stages: List[str], options: dict) -> List[dict]:
+    logging.basicConfig(level=logging.WARNING)
+    # Imported in the worker so the parent stays light and import time is not measured
+    from sklearn.model_selection import train_test_split
+    from src.data_loading import load_data, BOSTON_DTYPES
+    from src.data_preprocessing import preprocess_data
+    from src.eda import explore_data
+    from src.model_evaluation import evaluate_models, iter_test_chunks
+    from src.model_training import train_models
+    from src.hyperparameter_tuning import hyperparameter_tuning
+    from src.profiling import StageProfiler
+
+    profiler = StageProfiler(trace_memory=options['trace_memory']).activate()
+    df = load_data(filepath, dtype=BOSTON_DTYPES)
+    if 'eda' in stages:
+        explore_data(df, output_dir=options['eda_dir'], mode='full', n_jobs=options['n_jobs'])
+    X, y, preprocessor = preprocess_data(df)
+    del df
+    with profiler.stage('split', rows=len(X)):
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    del X, y
+    if {'train', 'evaluate', 'tune'} & set(stages):
+        models = train_models(X_train, y_train, preprocessor, n_jobs=options['n_jobs'])
+        if 'evaluate' in stages:
+            evaluate_models(models, iter_test_chunks(X_test, y_test, chunk_size=1_000_000))
+        if 'tune' in stages:
+            hyperparameter_tuning(models['Decision Tree'], X_train, y_train, TUNING_GRID,
+                                  cache_preprocessing=True, strategy=options['tune_strategy'])
+    profiler.deactivate()
+    return profiler.stages
+
+def generate_in_fresh_process(filepath: str, rows: int, **options) -> str:
+    """
+    Write synthetic data from a worker process. ru_maxrss survives exec, so
+    generating in the parent would inflate the peak RSS of every process it
+    spawns afterwards.
+    """
+    from src.synthetic_data import write_boston_like_csv
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(write_boston_like_csv, (filepath, rows), options)
+
+def run_in_fresh_process(filepath: str, stages: List[str], options: dict) -> List[dict]:
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(_run_pipeline, (filepath, stages, options))
+
+def parse_sizes(value: str) -> List[int]:
+    return [int(float(size)) for size in value.split(',')]
+
+def summarize(stages: List[dict]) -> Dict[str, dict]:
+    """
+    Sum repeated top-level stages (e.g. several evaluations) by name.
+    """
+    summary: Dict[str, dict] = {}
+    for record in stages:
+        if record['parent'] is not None:
+            continue
+        entry = summary.setdefault(record['stage'], {'seconds': 0.0, 'cpu_seconds': 0.0,
+                                                      'peak_rss_mb': 0.0, 'rows': record['rows']})
+        entry['seconds'] += record['wall_seconds']
+        entry['cpu_seconds'] += record['cpu_seconds']
+        entry['peak_rss_mb'] = max(entry['peak_rss_mb'], record['peak_rss_mb'])
+        if 'traced_peak_mb' in record:
+            entry['traced_peak_mb'] = max(entry.get('traced_peak_mb', 0.0), record['traced_peak_mb'])
+    return summary
+
+def print_table(results: Dict[str, Dict[str, dict]], baseline: Optional[Dict[str, Dict[str, dict]]]) -> None:
+    header = f"{'rows':>12}{'stage':>12}{'seconds':>10}{'cpu s':>10}{'peak RSS MB':>13}"
+    if baseline:
+        header += f"{'vs base':>10}"
+    print(header)
+    for size, summary in results.items():
+        for stage, entry in summary.items():
+            line = (f"{int(size):>12}{stage:>12}{entry['seconds']:>10.2f}{entry['cpu_seconds']:>10.2f}"
+                    f"{entry['peak_rss_mb']:>13.0f}")
+            base = (baseline or {}).get(size, {}).get(stage)
+            if base and base['seconds'] > 0:
+                line += f"{entry['seconds'] / base['seconds']:>9.2f}x"
+            print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark on synthetic data.")
+    parser.add_argument('--sizes', type=parse_sizes, default=parse_sizes('1e4,1e5,1e6'),
+                        help="Comma-separated row counts, e.g. 1e4,1e5,1e6,1e7,1e8.")
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help=f"Comma-separated subset of {','.join(STAGES)}; load, preprocess and split always run.")
+    parser.add_argument('--tune-strategy', default='grid', help="Search strategy passed to hyperparameter_tuning.")
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--missing-rate', type=float, default=0.02)
+    parser.add_argument('--trace-memory', action='store_true', help="Also record tracemalloc peaks (slower).")
+    parser.add_argument('--output', default=None, help="Write the per-stage results to this JSON file.")
+    parser.add_argument('--baseline', default=None, help="JSON from an earlier --output run to compare against.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    stages = args.stages.split(',')
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"Unknown stages: {sorted(unknown)}")
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    results: Dict[str, Dict[str, dict]] = {}
+    workdir = tempfile.mkdtemp(prefix='bench_pipeline_')
+    try:
+        for size in args.sizes:
+            filepath = os.path.join(workdir, f"synthetic_{size}.csv")
+            start = time.perf_counter()
+            generate_in_fresh_process(filepath, size, missing_rate=args.missing_rate)
+            print(f"Generated {size} rows ({os.path.getsize(filepath) / 2**20:.1f} MB) "
+                  f"in {time.perf_counter() - start:.1f}s")
+            options = {
+                'trace_memory': args.trace_memory,
+                'n_jobs': args.n_jobs,
+                'tune_strategy': args.tune_strategy,
+                'eda_dir': os.path.join(workdir, 'eda')
+            }
+            results[str(size)] = summarize(run_in_fresh_process(filepath, stages, options))
+            os.remove(filepath)
+    finally:
+        shutil.rmtree(workdir)
+
+    print_table(results, baseline)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'stages': stages, 'tune_strategy': args.tune_strategy, 'results': results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
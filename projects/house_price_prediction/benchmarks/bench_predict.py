@@ -0,0 +1,59 @@
+# benchmarks/bench_predict.py
+#
+# Compare per-row scoring via make_prediction against chunked predict_batch.
+# Run from the project root:
+#     python -m benchmarks.bench_predict --rows 100000
+
+import argparse
+import logging
+import time
+import pandas as pd
+from src.data_loading import TARGET_COLUMN
+from src.predict import make_prediction, predict_batch, DEFAULT_CHUNK_SIZE
+from src.utils import set_model_cache_size
+
+def build_input(data_filepath: str, rows: int) -> pd.DataFrame:
+    """
+    Tile the dataset until it holds the requested number of feature rows.
+    """
+    df = pd.read_csv(data_filepath).drop(columns=[TARGET_COLUMN])
+    repeats = -(-rows // len(df))
+    return pd.concat([df] * repeats, ignore_index=True).iloc[:rows]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-row vs. batch prediction.")
+    parser.add_argument('--model', default='models/best_decision_tree_model.joblib')
+    parser.add_argument('--data', default='data/boston_housing.csv')
+    parser.add_argument('--rows', type=int, default=100_000, help="Rows scored by predict_batch.")
+    parser.add_argument('--per-row-rows', type=int, default=200, help="Rows scored by make_prediction.")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--no-model-cache', action='store_true',
+                        help="Disable the load_model cache so every make_prediction call reloads the model.")
+    args = parser.parse_args()
+
+    # Keep the per-call log lines of make_prediction out of the timings
+    logging.basicConfig(level=logging.WARNING)
+    if args.no_model_cache:
+        set_model_cache_size(0)
+
+    df = build_input(args.data, args.rows)
+    records = df.iloc[:args.per_row_rows].to_dict(orient='records')
+
+    start = time.perf_counter()
+    for record in records:
+        make_prediction(args.model, record)
+    per_row_seconds = time.perf_counter() - start
+    per_row_rate = len(records) / per_row_seconds
+
+    start = time.perf_counter()
+    predictions = predict_batch(args.model, df, chunk_size=args.chunk_size)
+    batch_seconds = time.perf_counter() - start
+    batch_rate = len(predictions) / batch_seconds
+
+    print(f"{'path':<16}{'rows':>10}{'seconds':>10}{'rows/sec':>14}")
+    print(f"{'make_prediction':<16}{len(records):>10}{per_row_seconds:>10.3f}{per_row_rate:>14,.0f}")
+    print(f"{'predict_batch':<16}{len(predictions):>10}{batch_seconds:>10.3f}{batch_rate:>14,.0f}")
+    print(f"Speedup: {batch_rate / per_row_rate:,.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_search.py
+#
+# Compare search strategies of hyperparameter_tuning: fits, wall time and the
+# hold-out R2 of the estimator each one returns. Run from the project root:
+#     python -m benchmarks.bench_search --rows 50000 --strategies grid halving random
+
+import argparse
+import logging
+import time
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.tree import DecisionTreeRegressor
+from src.data_preprocessing import preprocess_data
+from src.hyperparameter_tuning import hyperparameter_tuning, STRATEGIES
+
+PARAM_GRID = {
+    'regressor__max_depth': [None, 5, 10, 20, 30],
+    'regressor__min_samples_split': [2, 5, 10],
+    'regressor__min_samples_leaf': [1, 2, 4]
+}
+
+class _FitCountHandler(logging.Handler):
+    """
+    Capture the fit summary line that hyperparameter_tuning logs.
+    """
+
+    def __init__(self):
+        super().__init__(level=logging.INFO)
+        self.summary = ''
+
+    def emit(self, record):
+        message = record.getMessage()
+        if message.startswith('Strategy'):
+            self.summary = message
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare hyperparameter search strategies.")
+    parser.add_argument('--data', default='data/boston_housing.csv')
+    parser.add_argument('--rows', type=int, default=50_000, help="Tile the dataset to this many rows.")
+    parser.add_argument('--strategies', nargs='+', default=['grid', 'halving', 'random'], choices=STRATEGIES)
+    parser.add_argument('--max-fits', type=int, help="Fit budget applied to every strategy.")
+    parser.add_argument('--time-budget', type=float, help="Wall-clock budget in seconds (not for halving).")
+    args = parser.parse_args()
+
+    # Only the capturing handler is attached, so the tuning log stays off the console
+    handler = _FitCountHandler()
+    logging.getLogger().addHandler(handler)
+    logging.getLogger().setLevel(logging.INFO)
+
+    df = pd.read_csv(args.data)
+    df = pd.concat([df] * -(-args.rows // len(df)), ignore_index=True).iloc[:args.rows]
+    X, y, preprocessor = preprocess_data(df)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    pipeline = Pipeline(steps=[
+        ('preprocessor', preprocessor),
+        ('regressor', DecisionTreeRegressor(random_state=42))
+    ])
+
+    print(f"{'strategy':<10}{'seconds':>10}{'test R2':>10}  fits")
+    for strategy in args.strategies:
+        start = time.perf_counter()
+        best = hyperparameter_tuning(pipeline, X_train, y_train, PARAM_GRID, strategy=strategy,
+                                     max_fits=args.max_fits, time_budget=args.time_budget)
+        seconds = time.perf_counter() - start
+        print(f"{strategy:<10}{seconds:>10.2f}{best.score(X_test, y_test):>10.4f}  {handler.summary}")
+
+if __name__ == "__main__":
+    main()
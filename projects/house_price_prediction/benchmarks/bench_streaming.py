@@ -0,0 +1,80 @@
+# benchmarks/bench_streaming.py
+#
+# Compare out-of-core training (train_model_streaming) with fitting a
+# LinearRegression pipeline on the fully loaded data: wall time, peak RSS and
+# how far the predictions are apart. Each run uses a fresh process.
+# Run from the project root:
+#     python -m benchmarks.bench_streaming --rows 2000000 --chunksize 100000
+
+import argparse
+import logging
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+import numpy as np
+from benchmarks.bench_pipeline import generate_in_fresh_process
+
+def _predict_probe(model, probe_path: str) -> np.ndarray:
+    import pandas as pd
+    from src.data_loading import BOSTON_DTYPES, TARGET_COLUMN
+    probe = pd.read_csv(probe_path, dtype=BOSTON_DTYPES).drop(columns=TARGET_COLUMN)
+    return model.predict(probe)
+
+def _run(mode: str, filepath: str, probe_path: str, chunksize: int, sample_size: int) -> dict:
+    logging.basicConfig(level=logging.WARNING)
+    from sklearn.linear_model import LinearRegression
+    from sklearn.pipeline import Pipeline
+    from src.data_loading import load_data, BOSTON_DTYPES
+    from src.data_preprocessing import preprocess_data
+    from src.model_training import train_model_streaming
+
+    start = time.perf_counter()
+    if mode == 'in-memory':
+        X, y, preprocessor = preprocess_data(load_data(filepath, dtype=BOSTON_DTYPES))
+        model = Pipeline([('preprocessor', preprocessor), ('regressor', LinearRegression())]).fit(X, y)
+        del X, y
+    else:
+        model = train_model_streaming(filepath, chunksize=chunksize, dtype=BOSTON_DTYPES,
+                                      solver=mode.split()[-1], sample_size=sample_size)
+    seconds = time.perf_counter() - start
+    return {
+        'seconds': seconds,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KiB on Linux
+        'predictions': _predict_probe(model, probe_path)
+    }
+
+def run_in_fresh_process(*args) -> dict:
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(_run, args)
+
+def main():
+    parser = argparse.ArgumentParser(description="Out-of-core vs. in-memory linear model training.")
+    parser.add_argument('--rows', type=lambda value: int(float(value)), default=2_000_000)
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--sample-size', type=int, default=100_000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    workdir = tempfile.mkdtemp(prefix='bench_streaming_')
+    try:
+        filepath = generate_in_fresh_process(os.path.join(workdir, 'data.csv'), args.rows)
+        probe_path = generate_in_fresh_process(os.path.join(workdir, 'probe.csv'), 10_000, random_state=7)
+        results = {mode: run_in_fresh_process(mode, filepath, probe_path, args.chunksize, args.sample_size)
+                   for mode in ('in-memory', 'streaming ols', 'streaming sgd')}
+    finally:
+        shutil.rmtree(workdir)
+
+    reference = results['in-memory']['predictions']
+    print(f"{args.rows} rows, chunks of {args.chunksize}, imputer sample of {args.sample_size}")
+    print(f"{'mode':<16}{'seconds':>10}{'peak RSS MB':>13}{'max |diff|':>13}{'mean |diff|':>13}")
+    for mode, stats in results.items():
+        diff = np.abs(stats['predictions'] - reference)
+        print(f"{mode:<16}{stats['seconds']:>10.2f}{stats['peak_rss_mb']:>13.0f}"
+              f"{diff.max():>13.2e}{diff.mean():>13.2e}")
+
+if __name__ == "__main__":
+    main()
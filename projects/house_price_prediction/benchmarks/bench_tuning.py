@@ -0,0 +1,54 @@
+# benchmarks/bench_tuning.py
+#
+# Compare hyperparameter_tuning wall time with and without preprocessing caching.
+# Run from the project root:
+#     python -m benchmarks.bench_tuning --rows 50000
+
+import argparse
+import logging
+import time
+import pandas as pd
+from sklearn.model_selection import ParameterGrid, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.tree import DecisionTreeRegressor
+from src.data_preprocessing import preprocess_data
+from src.hyperparameter_tuning import hyperparameter_tuning
+
+PARAM_GRID = {
+    'regressor__max_depth': [None, 5, 10, 20, 30],
+    'regressor__min_samples_split': [2, 5, 10],
+    'regressor__min_samples_leaf': [1, 2, 4]
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark preprocessing caching in hyperparameter_tuning.")
+    parser.add_argument('--data', default='data/boston_housing.csv')
+    parser.add_argument('--rows', type=int, default=50_000, help="Tile the dataset to this many rows.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    df = pd.read_csv(args.data)
+    df = pd.concat([df] * -(-args.rows // len(df)), ignore_index=True).iloc[:args.rows]
+    X, y, preprocessor = preprocess_data(df)
+    X_train, _, y_train, _ = train_test_split(X, y, test_size=0.2, random_state=42)
+    pipeline = Pipeline(steps=[
+        ('preprocessor', preprocessor),
+        ('regressor', DecisionTreeRegressor(random_state=42))
+    ])
+
+    results = {}
+    for label, cache in [('no cache', False), ('cached', True)]:
+        start = time.perf_counter()
+        best = hyperparameter_tuning(pipeline, X_train, y_train, PARAM_GRID, cache_preprocessing=cache)
+        results[label] = (time.perf_counter() - start, best.named_steps['regressor'].get_params())
+
+    print(f"Rows: {len(X_train)} train, {len(ParameterGrid(PARAM_GRID))} candidates x 5 folds")
+    for label, (seconds, _) in results.items():
+        print(f"{label:<10}{seconds:>10.2f} s")
+    saved = results['no cache'][0] - results['cached'][0]
+    print(f"Saved: {saved:.2f} s ({saved / results['no cache'][0]:.0%})")
+    print(f"Same best parameters: {results['no cache'][1] == results['cached'][1]}")
+
+if __name__ == "__main__":
+    main()
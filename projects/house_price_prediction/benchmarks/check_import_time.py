@@ -0,0 +1,76 @@
+# benchmarks/check_import_time.py
+#
+# Import-time regression check based on `python -X importtime`. Each entry
+# point is imported in a fresh interpreter; the check fails (exit code 1) if
+# it pulls in a module it should load lazily, or if it exceeds --max-ms.
+# Run from the project root:
+#     python -m benchmarks.check_import_time
+#     python -m benchmarks.check_import_time --max-ms 300 src.predict
+
+import argparse
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+PLOTTING = ('matplotlib', 'seaborn')
+TRAINING = ('sklearn', 'scipy')
+
+# Modules each entry point must not import at module scope
+ENTRY_POINTS: Dict[str, Tuple[str, ...]] = {
+    'src.utils': ('numpy', 'pandas', 'joblib') + TRAINING + PLOTTING,
+    'src.compiled_model': ('pandas', 'joblib') + TRAINING + PLOTTING,
+    'src.predict': ('numpy', 'pandas', 'joblib') + TRAINING + PLOTTING,
+    'src.server': ('numpy', 'pandas', 'joblib') + TRAINING + PLOTTING,
+    'src.data_loading': ('joblib',) + TRAINING + PLOTTING,
+    'src.eda': TRAINING + PLOTTING,
+}
+
+def import_profile(module: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Import `module` in a fresh interpreter with -X importtime.
+
+    Returns:
+    - Cumulative import time of `module` in milliseconds.
+    - Cumulative milliseconds per imported module.
+    """
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                            capture_output=True, text=True, check=True).stderr
+    modules = {}
+    for line in stderr.splitlines():
+        # "import time:  self [us] |  cumulative | imported package"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative) / 1000
+    return modules[module], modules
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if entry points import heavy modules eagerly.")
+    parser.add_argument('modules', nargs='*', default=list(ENTRY_POINTS),
+                        help="Entry points to check (default: all known ones).")
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help="Also fail if an entry point takes longer than this to import.")
+    parser.add_argument('--repeat', type=int, default=3, help="Imports per entry point; the fastest counts.")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'entry point':<22}{'import ms':>10}  heavy modules imported")
+    for module in args.modules:
+        profiles = [import_profile(module) for _ in range(args.repeat)]
+        milliseconds, imported = min(profiles, key=lambda profile: profile[0])
+        forbidden = ENTRY_POINTS.get(module, ())
+        heavy = sorted(name for name in imported if '.' not in name and name in TRAINING + PLOTTING
+                       + ('numpy', 'pandas', 'joblib', 'pyarrow'))
+        print(f"{module:<22}{milliseconds:>10.1f}  {', '.join(heavy) or '-'}")
+        eager = [name for name in forbidden if name in imported]
+        if eager:
+            failures.append(f"{module} imports {', '.join(eager)} at import time")
+        if args.max_ms is not None and milliseconds > args.max_ms:
+            failures.append(f"{module} took {milliseconds:.1f} ms to import (limit {args.max_ms:.0f} ms)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
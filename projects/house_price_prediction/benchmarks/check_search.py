@@ -0,0 +1,66 @@
+# benchmarks/check_search.py
+#
+# Sanity check for the successive halving searches of hyperparameter_tuning.
+# Every candidate of the first round must have a finite mean R2; a NaN means
+# the round ran on too few rows and candidates were dropped arbitrarily.
+# Fails with exit code 1 otherwise. Run from the project root:
+#     python -m benchmarks.check_search
+#     python -m benchmarks.check_search --max-fits 45 90 --rows 2000
+
+import argparse
+import logging
+import sys
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.tree import DecisionTreeRegressor
+from src.data_preprocessing import preprocess_data
+from src.hyperparameter_tuning import CV_FOLDS, _halving_search
+
+PARAM_GRID = {
+    'regressor__max_depth': [None, 5, 10, 20, 30],
+    'regressor__min_samples_split': [2, 5, 10],
+    'regressor__min_samples_leaf': [1, 2, 4]
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if a halving search scores its first round as NaN.")
+    parser.add_argument('--data', default='data/boston_housing.csv')
+    parser.add_argument('--rows', type=int, default=None, help="Tile the dataset to this many rows.")
+    parser.add_argument('--max-fits', type=int, nargs='+', default=[30, 45, 90],
+                        help="Fit budgets to check; the unbudgeted grid is always checked.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    df = pd.read_csv(args.data)
+    if args.rows is not None:
+        df = pd.concat([df] * -(-args.rows // len(df)), ignore_index=True).iloc[:args.rows]
+    X, y, preprocessor = preprocess_data(df)
+    X_train, _, y_train, _ = train_test_split(X, y, test_size=0.2, random_state=42)
+    pipeline = Pipeline(steps=[
+        ('preprocessor', preprocessor),
+        ('regressor', DecisionTreeRegressor(random_state=42))
+    ])
+
+    failures = []
+    print(f"{'max_fits':>9}{'candidates':>12}{'first-round rows':>18}{'NaN scores':>12}")
+    for max_fits in [None] + args.max_fits:
+        max_candidates = None if max_fits is None else max(1, max_fits // CV_FOLDS)
+        search = _halving_search(pipeline, PARAM_GRID, max_candidates, CV_FOLDS, random_state=42,
+                                 n_jobs=1, verbose=0)
+        search.fit(X_train, y_train)
+        first_round = search.cv_results_['iter'] == 0
+        scores = search.cv_results_['mean_test_score'][first_round]
+        n_nan = int((~np.isfinite(scores)).sum())
+        label = 'grid' if max_fits is None else max_fits
+        print(f"{label:>9}{len(scores):>12}{search.n_resources_[0]:>18}{n_nan:>12}")
+        if n_nan:
+            failures.append(f"max_fits={label}: {n_nan} of {len(scores)} first-round scores are not finite")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
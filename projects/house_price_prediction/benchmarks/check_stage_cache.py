@@ -0,0 +1,67 @@
+# benchmarks/check_stage_cache.py
+#
+# Invalidation check for the stage cache. Every stage main.py caches must be
+# versioned by its own module, not by the module of a decorator wrapping it,
+# and editing a decorated stage's module must change its version. Fails with
+# exit code 1 otherwise. Run from the project root:
+#     python -m benchmarks.check_stage_cache
+
+import hashlib
+import inspect
+import os
+import subprocess
+import sys
+import tempfile
+from src.data_loading import load_data
+from src.data_preprocessing import preprocess_data
+from src.hyperparameter_tuning import hyperparameter_tuning
+from src.model_evaluation import evaluate_model, evaluate_models
+from src.model_training import train_models
+from src.stage_cache import code_version
+
+STAGES = (load_data, preprocess_data, train_models, evaluate_models, evaluate_model, hyperparameter_tuning)
+
+# A stage decorated like the real ones, with a body that the check edits
+STAGE_MODULE = '''from src.profiling import profile_stage
+
+@profile_stage('edited')
+def edited_stage(x):
+    return x + {increment}
+'''
+
+def file_hash(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def version_in_fresh_process(module_dir: str) -> str:
+    # code_version memoizes per file, so each version is computed in a new interpreter
+    script = ("import sys; sys.path.insert(0, sys.argv[1]); from edited_stage import edited_stage; "
+              "from src.stage_cache import code_version; print(code_version(edited_stage))")
+    return subprocess.run([sys.executable, '-c', script, module_dir],
+                          capture_output=True, text=True, check=True).stdout.strip()
+
+def main():
+    failures = []
+    print(f"{'stage':<24}versioned by")
+    for func in STAGES:
+        own_file = inspect.getsourcefile(inspect.unwrap(func))
+        print(f"{func.__name__:<24}{os.path.relpath(own_file)}")
+        if code_version(func) != file_hash(own_file):
+            failures.append(f"{func.__name__} is not versioned by its own module {own_file}")
+
+    with tempfile.TemporaryDirectory(prefix='check_stage_cache_') as module_dir:
+        versions = []
+        for increment in (1, 2):
+            with open(os.path.join(module_dir, 'edited_stage.py'), 'w') as f:
+                f.write(STAGE_MODULE.format(increment=increment))
+            versions.append(version_in_fresh_process(module_dir))
+    print(f"{'edited decorated stage':<24}{'version changed' if versions[0] != versions[1] else 'version unchanged'}")
+    if versions[0] == versions[1]:
+        failures.append("editing a decorated stage's module does not change its version")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
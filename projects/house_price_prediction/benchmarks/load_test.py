@@ -0,0 +1,139 @@
+# benchmarks/load_test.py
+#
+# Closed-loop load generator for src/server.py. By default it starts the
+# server twice (batching on and off) and reports throughput and latency
+# percentiles for each. Run from the project root:
+#     python -m benchmarks.load_test --requests 5000 --concurrency 64
+# or point it at an already running server:
+#     python -m benchmarks.load_test --url http://127.0.0.1:8000
+
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List
+from urllib.parse import urlparse
+import numpy as np
+import pandas as pd
+from src.data_loading import TARGET_COLUMN
+
+async def _client(host: str, port: int, payloads: List[bytes], latencies: List[float]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in payloads:
+            request = (
+                f"POST /predict HTTP/1.1\r\nHost: {host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+            ).encode() + body
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            length = 0
+            status = await reader.readline()
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.strip().lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not status.startswith(b'HTTP/1.1 200'):
+                raise RuntimeError(f"Request failed: {status.decode().strip()}")
+    finally:
+        writer.close()
+
+async def run_load(host: str, port: int, rows: List[dict], requests: int, concurrency: int) -> Dict[str, float]:
+    """
+    Send `requests` single-row requests from `concurrency` keep-alive connections.
+
+    Returns:
+    - Dictionary with throughput and latency percentiles in milliseconds.
+    """
+    payloads = [json.dumps(rows[i % len(rows)]).encode() for i in range(requests)]
+    latencies: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, payloads[i::concurrency], latencies) for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'throughput': len(latencies) / elapsed,
+        'p50': float(np.percentile(latencies_ms, 50)),
+        'p95': float(np.percentile(latencies_ms, 95)),
+        'p99': float(np.percentile(latencies_ms, 99))
+    }
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def _wait_for_port(port: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Server did not start on port {port} within {timeout}s")
+
+def run_against_spawned_server(model: str, server_args: List[str], rows: List[dict],
+                               requests: int, concurrency: int) -> Dict[str, float]:
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'src.server', '--model', model, '--port', str(port), *server_args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        _wait_for_port(port)
+        return asyncio.run(run_load('127.0.0.1', port, rows, requests, concurrency))
+    finally:
+        process.terminate()
+        process.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the HTTP inference server.")
+    parser.add_argument('--url', help="Target an already running server instead of spawning one.")
+    parser.add_argument('--model', default='models/best_decision_tree_model.joblib')
+    parser.add_argument('--data', default='data/boston_housing.csv')
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    rows = pd.read_csv(args.data).drop(columns=[TARGET_COLUMN]).to_dict(orient='records')
+
+    if args.url:
+        target = urlparse(args.url)
+        results = {args.url: asyncio.run(
+            run_load(target.hostname, target.port or 80, rows, args.requests, args.concurrency)
+        )}
+    else:
+        results = {
+            'batching on': run_against_spawned_server(
+                args.model,
+                ['--max-batch-size', str(args.max_batch_size), '--max-wait-ms', str(args.max_wait_ms)],
+                rows, args.requests, args.concurrency
+            ),
+            'batching off': run_against_spawned_server(
+                args.model, ['--max-batch-size', '1'], rows, args.requests, args.concurrency
+            )
+        }
+
+    print(f"{'mode':<14}{'requests':>10}{'req/sec':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for mode, stats in results.items():
+        print(f"{mode:<14}{stats['requests']:>10}{stats['throughput']:>12,.0f}"
+              f"{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['p99']:>10.2f}")
+
+if __name__ == "__main__":
+    main()
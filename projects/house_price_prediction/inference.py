@@ -1,8 +1,8 @@
-import pandas as pd
-from src.utils import load_model
+from src.predict import make_prediction
 
-# Load the saved model
-model = load_model('models/best_decision_tree_model.joblib')
+# Path to the saved model; models saved with model_format='compiled' are
+# scored without importing pandas or sklearn
+model_path = 'models/best_decision_tree_model.joblib'
 
 # Example input data
 input_data = {
@@ -21,9 +21,6 @@ input_data = {
     'lstat': 4.98
 }
 
-# Convert to DataFrame
-input_df = pd.DataFrame([input_data])
-
 # Make prediction
-predicted_price = model.predict(input_df)[0]
-print(f"Predicted Price: {predicted_price:.2f} (in $1000's)")
\ No newline at end of file
+predicted_price = make_prediction(model_path, input_data)
+print(f"Predicted Price: {predicted_price:.2f} (in $1000's)")
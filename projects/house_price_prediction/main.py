@@ -1,14 +1,22 @@
 # scripts/main.py
 
+import argparse
 import logging
 import os
-from src.data_loading import load_data
+from src.data_loading import load_data, file_content_hash, BOSTON_DTYPES
 from src.data_preprocessing import preprocess_data
-from src.eda import explore_data
+from src.eda import explore_data, EDA_MODES
 from src.model_training import train_models
-from src.model_evaluation import evaluate_model
+from src.model_evaluation import evaluate_model, evaluate_models, iter_test_chunks
 from src.hyperparameter_tuning import hyperparameter_tuning
 from src.utils import save_model
+from src.profiling import StageProfiler
+from src.stage_cache import StageCache
+
+# Stages that can be named in --force, in execution order
+STAGES = ('load', 'preprocess', 'split', 'train', 'evaluate', 'tune', 'evaluate_tuned')
+# Per-candidate fold scores, reused when the tune stage reruns with a changed grid
+SEARCH_RESULTS_DIR = os.path.join('artifacts', 'search')
 
 def setup_logging():
     """
@@ -24,43 +32,94 @@ def setup_logging():
         ]
     )
 
+def parse_args():
+    """
+    Parse command-line options.
+    """
+    parser = argparse.ArgumentParser(description="Train and tune the Boston house price models.")
+    parser.add_argument('--eda', choices=EDA_MODES, default='incremental',
+                        help="Redraw all plots, only changed plots, or none.")
+    parser.add_argument('--skip-eda', action='store_true', help="Shorthand for --eda skip.")
+    parser.add_argument('--compact', action='store_true',
+                        help="Load and preprocess in float32 with downcast integers and a categorical chas.")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Record each stage's tracemalloc peak in the run report (slower).")
+    parser.add_argument('--cprofile-dir', default=None,
+                        help="Write a cProfile dump per stage to this directory.")
+    parser.add_argument('--force', action='append', default=[], choices=STAGES + ('all',), metavar='STAGE',
+                        help="Recompute STAGE even if its cached output is up to date (repeatable; 'all' for every stage).")
+    parser.add_argument('--no-cache', action='store_true', help="Run every stage without reading or writing the stage cache.")
+    return parser.parse_args()
+
 def main():
     """
     Main function to orchestrate the workflow.
     """
+    args = parse_args()
     setup_logging()
 
     # Define file paths
     data_filepath = os.path.join('data', 'boston_housing.csv')
     model_save_path = os.path.join('models', 'best_decision_tree_model.joblib')
+    data_cache_dir = os.path.join('data', 'cache')
+    run_report_path = os.path.join('logs', 'run_report.json')
+    stage_cache_dir = os.path.join('artifacts', 'stages')
 
     # Create necessary directories if they don't exist
     os.makedirs('eda', exist_ok=True)
     os.makedirs('models', exist_ok=True)
 
-    # Load data
-    df = load_data(data_filepath)
+    # Time every src stage; the report is written even if a stage fails
+    profiler = StageProfiler(trace_memory=args.trace_memory, cprofile_dir=args.cprofile_dir).activate()
+    cache = StageCache(stage_cache_dir, force=args.force, enabled=not args.no_cache)
+    try:
+        run_pipeline(args, data_filepath, data_cache_dir, model_save_path, profiler, cache)
+    finally:
+        profiler.deactivate()
+        profiler.write_report(run_report_path)
 
-    # EDA
-    explore_data(df)
+    logging.info("Project execution completed successfully.")
+
+def run_pipeline(args, data_filepath: str, data_cache_dir: str, model_save_path: str,
+                 profiler: StageProfiler, cache: StageCache) -> None:
+    """
+    Load, explore, preprocess, train, evaluate, tune and save.
+
+    Training, evaluation and tuning outputs are taken from the stage cache when
+    neither their code, their parameters nor any upstream stage changed. Load,
+    preprocess and split are cheap and always run, but still key their
+    dependents on the data's content hash.
+    """
+    # Load data (load_data keeps its own Parquet cache of the parsed CSV). The
+    # CSV is hashed once; the digest keys both this stage and the Parquet cache.
+    data_hash = file_content_hash(data_filepath)
+    df = cache.run('load', load_data, data_filepath, data=[data_hash], store=False,
+                   dtype=BOSTON_DTYPES, cache_dir=data_cache_dir, compact=args.compact, content_hash=data_hash)
+
+    # EDA (tracks its own inputs in eda/.eda_manifest.json)
+    explore_data(df, mode='skip' if args.skip_eda else args.eda)
 
     # Preprocess data
-    X, y, preprocessor = preprocess_data(df)
+    X, y, preprocessor = cache.run('preprocess', preprocess_data, df, depends=['load'], store=False,
+                                   compact=args.compact)
 
     # Split data
     from sklearn.model_selection import train_test_split
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
-    )
+    with profiler.stage('split', rows=len(X)):
+        X_train, X_test, y_train, y_test = cache.run(
+            'split', train_test_split, X, y, depends=['preprocess'], store=False,
+            test_size=0.2, random_state=42
+        )
     logging.info(f"Data split into train and test sets with sizes {X_train.shape} and {X_test.shape}")
 
     # Train models
-    models = train_models(X_train, y_train, preprocessor)
+    models = cache.run('train', train_models, X_train, y_train, preprocessor, depends=['split', 'preprocess'])
 
-    # Evaluate models
-    for name, model in models.items():
-        logging.info(f"Evaluating {name}...")
-        metrics = evaluate_model(model, X_test, y_test)
+    # Evaluate models against one shared read of the test data
+    logging.info(f"Evaluating {', '.join(models)}...")
+    all_metrics = cache.run('evaluate', evaluate_models, models, iter_test_chunks(X_test, y_test),
+                            depends=['train', 'split'])
+    for name, metrics in all_metrics.items():
         logging.info(f"{name} Evaluation Metrics:")
         for metric, value in metrics.items():
             logging.info(f"{metric}: {value:.4f}")
@@ -73,11 +132,12 @@ def main():
         'regressor__min_samples_leaf': [1, 2, 4]
     }
 
-    best_dt = hyperparameter_tuning(dt_pipeline, X_train, y_train, param_grid)
+    best_dt = cache.run('tune', hyperparameter_tuning, dt_pipeline, X_train, y_train, depends=['train', 'split'],
+                        param_grid=param_grid, cache_preprocessing=True, results_dir=SEARCH_RESULTS_DIR)
 
     # Evaluate the best Decision Tree
     logging.info("Evaluating the best Decision Tree after hyperparameter tuning...")
-    best_dt_metrics = evaluate_model(best_dt, X_test, y_test)
+    best_dt_metrics = cache.run('evaluate_tuned', evaluate_model, best_dt, X_test, y_test, depends=['tune', 'split'])
     logging.info("Best Decision Tree Evaluation Metrics:")
     for metric, value in best_dt_metrics.items():
         logging.info(f"{metric}: {value:.4f}")
@@ -85,7 +145,5 @@ def main():
     # Save the best model
     save_model(best_dt, model_save_path)
 
-    logging.info("Project execution completed successfully.")
-
 if __name__ == "__main__":
     main()
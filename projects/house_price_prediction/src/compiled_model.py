@@ -0,0 +1,269 @@
+# src/compiled_model.py
+#
+# Export a fitted preprocessing + regressor pipeline to flat NumPy arrays and
+# evaluate it without pandas or sklearn.
+
+import json
+import numpy as np
+from typing import Dict, List, Sequence, Union
+
+class CompiledModel:
+    """
+    Array-based equivalent of a fitted pipeline from main.py.
+
+    Supported pipelines: a ColumnTransformer with a numerical branch
+    (SimpleImputer + StandardScaler) and a categorical branch (SimpleImputer +
+    OneHotEncoder with numeric categories), followed by a LinearRegression or a
+    DecisionTreeRegressor. Input columns are ordered numerical first, then
+    categorical, as listed in `feature_names`.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: dict):
+        self.arrays = arrays
+        self.meta = meta
+        self.num_columns: List[str] = meta['num_columns']
+        self.cat_columns: List[str] = meta['cat_columns']
+        self.feature_names: List[str] = self.num_columns + self.cat_columns
+        self.kind: str = meta['kind']
+
+        self._num_fill = arrays['num_fill']
+        self._num_mean = arrays['num_mean']
+        self._num_scale = arrays['num_scale']
+        self._cat_fill = arrays['cat_fill']
+        offsets = arrays['cat_offsets']
+        self._cat_categories = [arrays['cat_values'][offsets[i]:offsets[i + 1]]
+                                for i in range(len(self.cat_columns))]
+        self._n_outputs = len(self._num_fill) + int(offsets[-1])
+
+        # Plain Python copies for predict_one, where per-element numpy indexing dominates
+        self._row_num = list(zip(self._num_fill.tolist(), self._num_mean.tolist(), self._num_scale.tolist()))
+        self._row_cat = [(fill, categories.tolist())
+                         for fill, categories in zip(self._cat_fill.tolist(), self._cat_categories)]
+        if self.kind == 'linear':
+            self._row_coef = arrays['coef'].tolist()
+            self._row_intercept = float(arrays['intercept'][0])
+        else:
+            self._row_tree = (arrays['left'].tolist(), arrays['right'].tolist(),
+                              arrays['feature'].tolist(), arrays['threshold'].tolist(),
+                              arrays['value'].tolist())
+            # For batches, leaves point to themselves so every row can take
+            # exactly `depth` vectorized steps without tracking which rows are done
+            leaf = arrays['left'] == -1
+            nodes = np.arange(len(leaf))
+            self._batch_left = np.where(leaf, nodes, arrays['left'])
+            self._batch_right = np.where(leaf, nodes, arrays['right'])
+            self._batch_feature = np.where(leaf, 0, arrays['feature'])
+            self._depth = _tree_depth(arrays['left'], arrays['right'])
+
+    @classmethod
+    def from_pipeline(cls, pipeline) -> "CompiledModel":
+        """
+        Extract the fitted parameters of a pipeline into arrays.
+
+        Parameters:
+        - pipeline: Fitted sklearn Pipeline whose first step is the ColumnTransformer
+          from preprocess_data and whose last step is the regressor.
+
+        Returns:
+        - CompiledModel evaluating the same function.
+        """
+        from sklearn.linear_model import LinearRegression
+        from sklearn.tree import DecisionTreeRegressor
+
+        preprocessor = pipeline.steps[0][1]
+        regressor = pipeline.steps[-1][1]
+
+        branches = {name: (transformer, list(columns))
+                    for name, transformer, columns in preprocessor.transformers_
+                    if transformer != 'drop' and len(columns)}
+        if set(branches) - {'num', 'cat'}:
+            raise ValueError(f"Unsupported ColumnTransformer branches: {sorted(branches)}")
+
+        arrays = {}
+        num_columns, cat_columns = [], []
+        if 'num' in branches:
+            transformer, num_columns = branches['num']
+            imputer = transformer.named_steps['imputer']
+            scaler = transformer.named_steps['scaler']
+            arrays['num_fill'] = np.asarray(imputer.statistics_, dtype=np.float64)
+            arrays['num_mean'] = (np.asarray(scaler.mean_, dtype=np.float64) if scaler.with_mean
+                                  else np.zeros(len(num_columns)))
+            arrays['num_scale'] = (np.asarray(scaler.scale_, dtype=np.float64) if scaler.with_std
+                                   else np.ones(len(num_columns)))
+        else:
+            arrays['num_fill'] = arrays['num_mean'] = arrays['num_scale'] = np.empty(0)
+
+        categories = []
+        if 'cat' in branches:
+            transformer, cat_columns = branches['cat']
+            encoder = transformer.named_steps['onehot']
+            if encoder.drop is not None:
+                raise ValueError("OneHotEncoder with drop is not supported.")
+            for values in encoder.categories_:
+                if not np.issubdtype(np.asarray(values).dtype, np.number):
+                    raise ValueError("Only numeric categories can be compiled.")
+                categories.append(np.asarray(values, dtype=np.float64))
+            arrays['cat_fill'] = np.asarray(transformer.named_steps['imputer'].statistics_, dtype=np.float64)
+        else:
+            arrays['cat_fill'] = np.empty(0)
+        arrays['cat_values'] = np.concatenate(categories) if categories else np.empty(0)
+        arrays['cat_offsets'] = np.cumsum([0] + [len(c) for c in categories]).astype(np.int64)
+
+        if isinstance(regressor, LinearRegression):
+            kind = 'linear'
+            arrays['coef'] = np.asarray(regressor.coef_, dtype=np.float64).ravel()
+            arrays['intercept'] = np.atleast_1d(np.asarray(regressor.intercept_, dtype=np.float64))
+        elif isinstance(regressor, DecisionTreeRegressor):
+            kind = 'tree'
+            tree = regressor.tree_
+            arrays['left'] = tree.children_left.astype(np.int64)
+            arrays['right'] = tree.children_right.astype(np.int64)
+            arrays['feature'] = tree.feature.astype(np.int64)
+            arrays['threshold'] = tree.threshold.astype(np.float64)
+            arrays['value'] = tree.value[:, 0, 0].astype(np.float64)
+        else:
+            raise ValueError(f"Unsupported regressor: {type(regressor).__name__}")
+
+        meta = {'kind': kind, 'num_columns': num_columns, 'cat_columns': cat_columns}
+        return cls(arrays, meta)
+
+    @property
+    def feature_names_in_(self) -> List[str]:
+        # Same attribute as fitted sklearn estimators, for code validating inputs
+        return self.feature_names
+
+    def save(self, path: str) -> None:
+        """
+        Write the arrays and metadata to an uncompressed .npz archive at
+        exactly `path` (np.savez would append '.npz' to a file name).
+        """
+        with open(path, 'wb') as f:
+            np.savez(f, meta=np.array(json.dumps(self.meta)), **self.arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledModel":
+        """
+        Read a model written by save().
+        """
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files if name != 'meta'}
+            meta = json.loads(str(data['meta']))
+        return cls(arrays, meta)
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """
+        Apply imputation, scaling and one-hot encoding to a raw feature matrix.
+
+        Parameters:
+        - X: Array of shape (n_rows, len(feature_names)).
+
+        Returns:
+        - Array of shape (n_rows, n_model_features).
+        """
+        X = np.asarray(X, dtype=np.float64)
+        n_num = len(self.num_columns)
+        out = np.empty((X.shape[0], self._n_outputs))
+
+        num = X[:, :n_num]
+        num = np.where(np.isnan(num), self._num_fill, num)
+        out[:, :n_num] = (num - self._num_mean) / self._num_scale
+
+        position = n_num
+        for i, categories in enumerate(self._cat_categories):
+            column = X[:, n_num + i]
+            column = np.where(np.isnan(column), self._cat_fill[i], column)
+            # Unknown categories encode to all zeros, like handle_unknown='ignore'
+            out[:, position:position + len(categories)] = column[:, None] == categories[None, :]
+            position += len(categories)
+        return out
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predict a batch of raw feature rows.
+
+        Parameters:
+        - X: Array of shape (n_rows, len(feature_names)), NaN for missing values,
+          or a DataFrame, whose columns are then selected by name.
+
+        Returns:
+        - Array of predictions.
+        """
+        if hasattr(X, 'columns'):
+            X = np.column_stack([np.asarray(X[name], dtype=np.float64) for name in self.feature_names])
+        features = self.transform(np.atleast_2d(X))
+        if self.kind == 'linear':
+            return features @ self.arrays['coef'] + self.arrays['intercept'][0]
+
+        # sklearn compares float32 copies of the features against the thresholds
+        features = features.astype(np.float32)
+        threshold = self.arrays['threshold']
+        rows = np.arange(len(features))
+        nodes = np.zeros(len(features), dtype=np.int64)
+        for _ in range(self._depth):
+            go_left = features[rows, self._batch_feature[nodes]] <= threshold[nodes]
+            nodes = np.where(go_left, self._batch_left[nodes], self._batch_right[nodes])
+        return self.arrays['value'][nodes]
+
+    def predict_columns(self, columns: Dict[str, Sequence[float]]) -> np.ndarray:
+        """
+        Predict a batch given as one array per feature name.
+        """
+        return self.predict(np.column_stack([np.asarray(columns[name], dtype=np.float64)
+                                             for name in self.feature_names]))
+
+    def predict_one(self, row: Union[Dict[str, float], Sequence[float]]) -> float:
+        """
+        Predict a single row given as a feature dictionary or a sequence in
+        `feature_names` order, without allocating intermediate arrays.
+        """
+        if isinstance(row, dict):
+            values = [float(row[name]) for name in self.feature_names]
+        else:
+            values = [float(value) for value in row]
+
+        n_num = len(self.num_columns)
+        features = []
+        for value, (fill, mean, scale) in zip(values, self._row_num):
+            if value != value:  # NaN
+                value = fill
+            features.append((value - mean) / scale)
+        for value, (fill, categories) in zip(values[n_num:], self._row_cat):
+            if value != value:
+                value = fill
+            features.extend(1.0 if value == category else 0.0 for category in categories)
+
+        if self.kind == 'linear':
+            return sum(f * c for f, c in zip(features, self._row_coef)) + self._row_intercept
+
+        left, right, feature, threshold, value = self._row_tree
+        # Round to float32 as sklearn does before comparing against the thresholds
+        features = np.asarray(features, dtype=np.float32).tolist()
+        node = 0
+        while left[node] != -1:
+            node = left[node] if features[feature[node]] <= threshold[node] else right[node]
+        return value[node]
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    """
+    Number of edges on the longest root-to-leaf path.
+    """
+    depth = 0
+    level = np.array([0])
+    while True:
+        level = level[left[level] != -1]
+        if not len(level):
+            return depth
+        level = np.concatenate([left[level], right[level]])
+        depth += 1
+
+def compile_pipeline(pipeline) -> CompiledModel:
+    """
+    Compile a fitted pipeline into a CompiledModel.
+
+    Parameters:
+    - pipeline: Fitted Pipeline as produced by train_models or hyperparameter_tuning.
+
+    Returns:
+    - CompiledModel.
+    """
+    return CompiledModel.from_pipeline(pipeline)
@@ -1,32 +1,194 @@
 # src/data_loading.py
 
+import os
+import hashlib
+import json
 import pandas as pd
 import logging
 import sys
+from typing import Dict, Iterator, List, Optional
+from src.profiling import profile_stage
 
 TARGET_COLUMN = 'medv'  # Define the target column
 
-def load_data(filepath: str) -> pd.DataFrame:
+# Column types of the Boston housing CSV, declared up front so pandas does not
+# have to infer them while parsing
+BOSTON_DTYPES: Dict[str, str] = {
+    'crim': 'float64',
+    'zn': 'float64',
+    'indus': 'float64',
+    'chas': 'int64',
+    'nox': 'float64',
+    'rm': 'float64',
+    'age': 'float64',
+    'dis': 'float64',
+    'rad': 'int64',
+    'tax': 'int64',
+    'ptratio': 'float64',
+    'b': 'float64',
+    'lstat': 'float64',
+    'medv': 'float64'
+}
+
+# Columns holding category codes rather than quantities
+CATEGORICAL_COLUMNS = ['chas']
+
+CACHE_FORMATS = ('parquet', 'feather')
+
+def file_content_hash(filepath: str, block_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 hex digest of a file's content.
+
+    Parameters:
+    - filepath: Path to the file.
+    - block_size: Number of bytes read per step.
+
+    Returns:
+    - Hex digest string.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def compact_dtypes(dtype: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+    """
+    Map declared float64 columns to float32 so they are parsed at half the size.
+    Integer columns are downcast after parsing, once their range is known.
+    """
+    if dtype is None:
+        return None
+    return {column: 'float32' if str(kind) == 'float64' else kind for column, kind in dtype.items()}
+
+def compact_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast a frame to the smallest types that hold its values.
+
+    Floats become float32, integers the smallest integer type covering their
+    range, and CATEGORICAL_COLUMNS become pandas categoricals (with integer
+    categories, so one-hot encoding still matches integer input at prediction
+    time).
+
+    Parameters:
+    - data: DataFrame to downcast.
+
+    Returns:
+    - Downcast DataFrame.
+    """
+    types = {}
+    for column in data.columns:
+        series = data[column]
+        if pd.api.types.is_float_dtype(series.dtype):
+            types[column] = 'float32'
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            types[column] = pd.to_numeric(series, downcast='integer').dtype
+    data = data.astype(types)
+    for column in CATEGORICAL_COLUMNS:
+        if column in data.columns and not isinstance(data[column].dtype, pd.CategoricalDtype):
+            data[column] = data[column].astype('category')
+    return data
+
+def _cache_path(filepath: str, cache_dir: str, cache_format: str,
+                dtype: Optional[Dict[str, str]], usecols: Optional[List[str]],
+                compact: bool = False, content_hash: Optional[str] = None) -> str:
+    # The read options are part of the key: the same CSV read with another
+    # schema produces a different frame
+    options = {'dtype': dtype, 'usecols': usecols}
+    if compact:
+        options['compact'] = True
+    options = json.dumps(options, sort_keys=True)
+    if content_hash is None:
+        content_hash = file_content_hash(filepath)
+    digest = hashlib.sha256((content_hash + options).encode()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    return os.path.join(cache_dir, f"{stem}-{digest}.{cache_format}")
+
+def _read_cache(path: str, cache_format: str) -> pd.DataFrame:
+    if cache_format == 'parquet':
+        return pd.read_parquet(path)
+    return pd.read_feather(path)
+
+def _write_cache(data: pd.DataFrame, path: str, cache_format: str) -> None:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    if cache_format == 'parquet':
+        data.to_parquet(tmp_path, index=False)
+    else:
+        data.reset_index(drop=True).to_feather(tmp_path)
+    # Atomic rename so a concurrent reader never sees a partial file
+    os.replace(tmp_path, path)
+
+def _validate_target(data: pd.DataFrame) -> None:
+    if TARGET_COLUMN not in data.columns:
+        logging.error(f"Target column '{TARGET_COLUMN}' not found in the dataset.")
+        print(f"Available columns: {data.columns.tolist()}")
+        sys.exit(1)
+
+@profile_stage('load')
+def load_data(filepath: str,
+              dtype: Optional[Dict[str, str]] = None,
+              usecols: Optional[List[str]] = None,
+              engine: Optional[str] = None,
+              cache_dir: Optional[str] = None,
+              cache_format: str = 'parquet',
+              compact: bool = False,
+              content_hash: Optional[str] = None) -> pd.DataFrame:
     """
     Load the Boston housing dataset from a CSV file.
 
     Parameters:
     - filepath: Path to the CSV file.
+    - dtype: Optional mapping of column names to dtypes, e.g. BOSTON_DTYPES.
+      Columns not listed are inferred as before.
+    - usecols: Optional list of columns to read; the others are skipped while parsing.
+    - engine: CSV parser passed to pandas ('c', 'python' or 'pyarrow').
+    - cache_dir: Directory for a columnar copy of the parsed frame. The copy is
+      keyed by the CSV's content hash and the read options, so repeat loads of
+      an unchanged file skip CSV parsing. Requires pyarrow; without it the
+      cache is skipped with a warning.
+    - cache_format: 'parquet' or 'feather'.
+    - compact: Downcast with compact_frame: float32 floats, the smallest
+      integer types and a categorical `chas`. Declared float64 columns are
+      parsed as float32 directly. The cached copy is stored compacted.
+    - content_hash: file_content_hash(filepath), if the caller already
+      computed it; the cache key then reuses it instead of hashing the file again.
 
     Returns:
     - DataFrame containing the dataset.
     """
+    if compact:
+        dtype = compact_dtypes(dtype)
+    if cache_format not in CACHE_FORMATS:
+        raise ValueError(f"cache_format must be one of {CACHE_FORMATS}, got '{cache_format}'")
+
     try:
-        data = pd.read_csv(filepath)
-        logging.info(f"Data loaded successfully with shape {data.shape}")
+        cache_path = None
+        if cache_dir is not None:
+            try:
+                import pyarrow  # noqa: F401  Optional dependency, only needed for the cache
+                cache_path = _cache_path(filepath, cache_dir, cache_format, dtype, usecols, compact,
+                                         content_hash)
+            except ImportError:
+                logging.warning("pyarrow is not installed; loading without the columnar cache.")
+
+        if cache_path is not None and os.path.exists(cache_path):
+            data = _read_cache(cache_path, cache_format)
+            logging.info(f"Data loaded from cache {cache_path} with shape {data.shape}")
+        else:
+            data = pd.read_csv(filepath, dtype=dtype, usecols=usecols, engine=engine)
+            logging.info(f"Data loaded successfully with shape {data.shape}")
+            if compact:
+                data = compact_frame(data)
+                logging.info(f"Data compacted to {data.memory_usage(deep=True).sum() / 2**20:.2f} MB")
+            if cache_path is not None:
+                _write_cache(data, cache_path, cache_format)
+                logging.info(f"Data cached to {cache_path}")
         logging.debug(f"Column Names: {data.columns.tolist()}")
 
         # Validate target column presence
-        if TARGET_COLUMN not in data.columns:
-            logging.error(f"Target column '{TARGET_COLUMN}' not found in the dataset.")
-            print(f"Available columns: {data.columns.tolist()}")
-            sys.exit(1)
-        
+        _validate_target(data)
+
         return data
     except FileNotFoundError as e:
         logging.error(f"File not found: {filepath}")
@@ -34,3 +196,34 @@ def load_data(filepath: str) -> pd.DataFrame:
     except Exception as e:
         logging.error(f"An error occurred while loading data: {e}")
         raise e
+
+def load_data_chunks(filepath: str,
+                     chunksize: int,
+                     dtype: Optional[Dict[str, str]] = None,
+                     usecols: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Load the dataset in chunks of at most `chunksize` rows.
+
+    Only one chunk is held in memory at a time. The C parser is used because
+    the pyarrow engine cannot read in chunks.
+
+    Parameters:
+    - filepath: Path to the CSV file.
+    - chunksize: Maximum number of rows per chunk.
+    - dtype: Optional mapping of column names to dtypes.
+    - usecols: Optional list of columns to read.
+
+    Returns:
+    - Iterator over DataFrame chunks.
+    """
+    try:
+        reader = pd.read_csv(filepath, dtype=dtype, usecols=usecols, chunksize=chunksize)
+    except FileNotFoundError as e:
+        logging.error(f"File not found: {filepath}")
+        raise e
+
+    with reader:
+        for i, chunk in enumerate(reader):
+            if i == 0:
+                _validate_target(chunk)
+            yield chunk
@@ -1,5 +1,6 @@
 # src/data_preprocessing.py
 
+import numpy as np
 import pandas as pd
 import logging
 from typing import Tuple
@@ -8,9 +9,34 @@ from sklearn.impute import SimpleImputer
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.compose import ColumnTransformer
 
-from src.data_loading import TARGET_COLUMN
+from src.data_loading import TARGET_COLUMN, CATEGORICAL_COLUMNS
+from src.profiling import profile_stage
 
-def preprocess_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series, ColumnTransformer]:
+def split_features(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Split a frame into features and target, with CATEGORICAL_COLUMNS as categoricals.
+
+    X is a shallow copy: it shares the feature columns with df instead of
+    copying them, and popping the target leaves df itself untouched.
+
+    Parameters:
+    - df: DataFrame including the target column.
+
+    Returns:
+    - X: Features.
+    - y: Target variable.
+    """
+    X = df.copy(deep=False)
+    y = X.pop(TARGET_COLUMN)
+
+    # Convert 'chas' to categorical if it's not already
+    for column in CATEGORICAL_COLUMNS:
+        if column in X.columns and not isinstance(X[column].dtype, pd.CategoricalDtype):
+            X[column] = X[column].astype('category')
+    return X, y
+
+@profile_stage('preprocess')
+def preprocess_data(df: pd.DataFrame, compact: bool = False) -> Tuple[pd.DataFrame, pd.Series, ColumnTransformer]:
     """
     Preprocess the dataset:
     - Handle missing values
@@ -19,21 +45,18 @@ def preprocess_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series, ColumnTr
 
     Parameters:
     - df: DataFrame to preprocess.
+    - compact: Make the preprocessor emit float32 instead of float64. Pair
+      with load_data(compact=True) so the inputs are float32 as well.
 
     Returns:
     - X: Features.
     - y: Target variable.
     - preprocessor: Preprocessing pipeline.
     """
-    X = df.drop(TARGET_COLUMN, axis=1)
-    y = df[TARGET_COLUMN]
-
-    # Convert 'chas' to categorical if it's not already
-    if 'chas' in X.columns:
-        X['chas'] = X['chas'].astype('category')
+    X, y = split_features(df)
 
-    # Identify numerical and categorical columns
-    numerical_cols = X.select_dtypes(include=['int64', 'float64']).columns.tolist()
+    # Identify numerical and categorical columns (of any width, so compact frames work)
+    numerical_cols = X.select_dtypes(include='number').columns.tolist()
     categorical_cols = X.select_dtypes(include=['object', 'category']).columns.tolist()
 
     logging.info(f"Numerical columns: {numerical_cols}")
@@ -47,7 +70,7 @@ def preprocess_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series, ColumnTr
 
     categorical_transformer = Pipeline(steps=[
         ('imputer', SimpleImputer(strategy='most_frequent')),
-        ('onehot', OneHotEncoder(handle_unknown='ignore'))
+        ('onehot', OneHotEncoder(handle_unknown='ignore', dtype=np.float32 if compact else np.float64))
     ])
 
     preprocessor = ColumnTransformer(transformers=[
@@ -1,64 +1,224 @@
 # src/eda.py
 
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import hashlib
+import json
 import logging
 import os
+from functools import partial
+from typing import Callable, Dict, List, Tuple
+from joblib import Parallel, delayed
 from src.data_loading import TARGET_COLUMN
+from src.streaming_stats import CorrelationAccumulator, top_correlated_features
+from src.profiling import profile_stage
 
-def explore_data(df: pd.DataFrame) -> None:
+EDA_MODES = ('full', 'incremental', 'skip')
+PLOT_VERSION = 2  # Bump when a plot's rendering code changes so cached plots are redrawn
+MANIFEST_FILENAME = '.eda_manifest.json'
+BINNED_ROW_THRESHOLD = 200_000  # Default row count above which the binned plots are drawn
+DENSITY_GRID_SIZE = 200  # Bins per axis of the binned scatter image
+CORRELATION_CHUNK_SIZE = 1_000_000  # Rows per update of the streaming correlation
+
+def _pyplot():
     """
-    Perform exploratory data analysis with visualizations.
+    Import pyplot and seaborn on the non-interactive Agg backend.
 
-    Parameters:
-    - df: DataFrame to analyze.
+    Imported lazily so worker processes and callers that skip EDA do not pay for them.
     """
-    logging.info("Starting exploratory data analysis...")
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    return plt, sns
 
-    # Ensure 'eda/' directory exists
-    os.makedirs('eda', exist_ok=True)
+def correlation_matrix(df: pd.DataFrame, chunk_size: int = CORRELATION_CHUNK_SIZE) -> pd.DataFrame:
+    """
+    Correlation matrix computed in one streaming pass over row chunks, so only
+    one chunk is converted to float64 at a time.
+    """
+    accumulator = CorrelationAccumulator()
+    for start in range(0, len(df), chunk_size):
+        accumulator.update(df.iloc[start:start + chunk_size])
+    return accumulator.correlation()
 
-    # Correlation matrix
+def _render_correlation(corr: pd.DataFrame, path: str) -> None:
+    plt, sns = _pyplot()
     plt.figure(figsize=(12,10))
-    corr = df.corr()
     sns.heatmap(corr, annot=True, fmt=".2f", cmap='coolwarm')
     plt.title("Correlation Matrix")
     plt.tight_layout()
-    plt.savefig('eda/correlation_matrix.png')  # Save the plot
+    plt.savefig(path)  # Save the plot
     plt.close()
 
-    # Distribution of target variable
+def density_grid(x: np.ndarray, y: np.ndarray, bins: int = DENSITY_GRID_SIZE) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count points on a regular 2D grid with vectorized integer binning.
+
+    Parameters:
+    - x, y: Coordinates; rows where either is NaN are ignored.
+    - bins: Number of bins per axis.
+
+    Returns:
+    - counts: Array of shape (bins, bins), indexed [y_bin, x_bin].
+    - x_edges, y_edges: Bin edges along each axis.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[valid], y[valid]
+    x_edges = np.linspace(x.min(), x.max(), bins + 1)
+    y_edges = np.linspace(y.min(), y.max(), bins + 1)
+    x_span = max(x_edges[-1] - x_edges[0], np.finfo(np.float64).tiny)
+    y_span = max(y_edges[-1] - y_edges[0], np.finfo(np.float64).tiny)
+    x_idx = np.minimum(((x - x_edges[0]) / x_span * bins).astype(np.int64), bins - 1)
+    y_idx = np.minimum(((y - y_edges[0]) / y_span * bins).astype(np.int64), bins - 1)
+    counts = np.bincount(y_idx * bins + x_idx, minlength=bins * bins).reshape(bins, bins)
+    return counts, x_edges, y_edges
+
+def _render_distribution(data: pd.DataFrame, path: str, binned: bool = False) -> None:
+    plt, sns = _pyplot()
     plt.figure(figsize=(8,6))
-    sns.histplot(df[TARGET_COLUMN], kde=True, bins=30)
+    if binned:
+        # The KDE is evaluated per row, so for large inputs draw the binned counts only
+        values = data[TARGET_COLUMN].dropna().to_numpy()
+        counts, edges = np.histogram(values, bins=30)
+        plt.stairs(counts, edges, fill=True, alpha=0.6)
+    else:
+        sns.histplot(data[TARGET_COLUMN], kde=True, bins=30)
     plt.title("Distribution of House Prices")
     plt.xlabel("Price (in $1000's)")
     plt.ylabel("Frequency")
     plt.tight_layout()
-    plt.savefig('eda/price_distribution.png')
+    plt.savefig(path)
+    plt.close()
+
+def _render_scatter(data: pd.DataFrame, path: str, feature: str, binned: bool = False) -> None:
+    plt, sns = _pyplot()
+    plt.figure(figsize=(8,6))
+    if binned:
+        # Draw a count image instead of one marker per row, so plot time stays flat as data grows
+        counts, x_edges, y_edges = density_grid(data[feature].to_numpy(), data[TARGET_COLUMN].to_numpy())
+        masked = np.ma.masked_equal(counts, 0)
+        plt.imshow(masked, origin='lower', aspect='auto', cmap='viridis', norm='log',
+                   extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]))
+        plt.colorbar(label="Count")
+    else:
+        sns.scatterplot(x=data[feature], y=data[TARGET_COLUMN])
+    plt.title(f"{feature.upper()} vs Price")
+    plt.xlabel(feature.upper())
+    plt.ylabel("Price (in $1000's)")
+    plt.tight_layout()
+    plt.savefig(path)
     plt.close()
 
+def _render_chas_boxplot(data: pd.DataFrame, path: str, binned: bool = False) -> None:
+    plt, sns = _pyplot()
+    plt.figure(figsize=(8,6))
+    # Outlier markers are drawn one per row, so leave them out for large inputs
+    sns.boxplot(x=data['chas'], y=data[TARGET_COLUMN], showfliers=not binned)
+    plt.title("CHAS vs Price")
+    plt.xlabel("CHAS (Charles River dummy variable)")
+    plt.ylabel("Price (in $1000's)")
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+def _plot_specs(df: pd.DataFrame, binned: bool) -> List[Tuple[str, Callable, List[str]]]:
+    """
+    List the plots to render as (filename, render function, input columns).
+    """
+    specs = [
+        ('correlation_matrix.png', _render_correlation, df.columns.tolist()),
+        ('price_distribution.png', partial(_render_distribution, binned=binned), [TARGET_COLUMN])
+    ]
+
     # Scatter plots of features vs target
     features = ['rm', 'lstat', 'ptratio']
     for feature in features:
-        plt.figure(figsize=(8,6))
-        sns.scatterplot(x=df[feature], y=df[TARGET_COLUMN])
-        plt.title(f"{feature.upper()} vs Price")
-        plt.xlabel(feature.upper())
-        plt.ylabel("Price (in $1000's)")
-        plt.tight_layout()
-        plt.savefig(f'eda/{feature}_vs_price.png')
-        plt.close()
+        specs.append((f'{feature}_vs_price.png', partial(_render_scatter, feature=feature, binned=binned),
+                      [feature, TARGET_COLUMN]))
 
     # Boxplot of 'chas' vs target
     if 'chas' in df.columns:
-        plt.figure(figsize=(8,6))
-        sns.boxplot(x=df['chas'], y=df[TARGET_COLUMN])
-        plt.title("CHAS vs Price")
-        plt.xlabel("CHAS (Charles River dummy variable)")
-        plt.ylabel("Price (in $1000's)")
-        plt.tight_layout()
-        plt.savefig('eda/chas_vs_price.png')
-        plt.close()
-
-    logging.info("Exploratory data analysis completed. Plots saved in 'eda/' directory.")
+        specs.append(('chas_vs_price.png', partial(_render_chas_boxplot, binned=binned),
+                      ['chas', TARGET_COLUMN]))
+
+    return specs
+
+def _columns_hash(df: pd.DataFrame, columns: List[str], filename: str, binned: bool) -> str:
+    digest = hashlib.sha256(f"{filename}:{PLOT_VERSION}:{binned}:{columns}".encode())
+    digest.update(pd.util.hash_pandas_object(df[columns], index=False).values.tobytes())
+    return digest.hexdigest()
+
+def _load_manifest(path: str) -> Dict[str, str]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+@profile_stage('eda')
+def explore_data(df: pd.DataFrame, output_dir: str = 'eda', mode: str = 'incremental',
+                 n_jobs: int = -1, binned_threshold: int = BINNED_ROW_THRESHOLD) -> None:
+    """
+    Perform exploratory data analysis with visualizations.
+
+    Plots are rendered in parallel worker processes. Each plot is keyed by a
+    hash of its input columns, recorded in a manifest in `output_dir`, so in
+    incremental mode only plots whose inputs changed are redrawn. Above
+    `binned_threshold` rows, scatter plots are drawn as a 2D count image, the
+    price histogram without its KDE and the boxplot without outlier markers,
+    so plot time stays roughly constant as the data grows.
+
+    Parameters:
+    - df: DataFrame to analyze.
+    - output_dir: Directory for the PNG files.
+    - mode: 'full' redraws every plot, 'incremental' redraws changed or missing
+      plots, 'skip' does nothing.
+    - n_jobs: Number of worker processes (-1 uses all cores).
+    - binned_threshold: Row count above which the binned rendering path is used.
+    """
+    if mode not in EDA_MODES:
+        raise ValueError(f"mode must be one of {EDA_MODES}, got '{mode}'")
+    if mode == 'skip':
+        logging.info("Skipping exploratory data analysis.")
+        return
+
+    logging.info("Starting exploratory data analysis...")
+
+    # Ensure output directory exists
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+    manifest = _load_manifest(manifest_path) if mode == 'incremental' else {}
+
+    binned = len(df) > binned_threshold
+    if binned:
+        logging.info(f"{len(df)} rows exceed {binned_threshold}; using binned plots.")
+
+    pending = []
+    for filename, render, columns in _plot_specs(df, binned):
+        path = os.path.join(output_dir, filename)
+        key = _columns_hash(df, columns, filename, binned)
+        if manifest.get(filename) == key and os.path.exists(path):
+            continue
+        manifest[filename] = key
+        if render is _render_correlation:
+            # Ship the small matrix to the worker instead of the whole frame
+            corr = correlation_matrix(df[columns])
+            logging.info(f"Top features correlated with {TARGET_COLUMN}:\n"
+                         f"{top_correlated_features(corr, TARGET_COLUMN)}")
+            pending.append((render, corr, path))
+        else:
+            pending.append((render, df[columns], path))
+
+    if not pending:
+        logging.info(f"All plots in '{output_dir}/' are up to date.")
+        return
+
+    Parallel(n_jobs=n_jobs)(delayed(render)(data, path) for render, data, path in pending)
+
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    logging.info(f"Exploratory data analysis completed. {len(pending)} plots saved in '{output_dir}/' directory.")
@@ -1,31 +1,355 @@
 # src/hyperparameter_tuning.py
 
+import json
 import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List, NamedTuple, Optional
+import joblib
+import numpy as np
+from joblib import Memory, effective_n_jobs
+from sklearn.base import clone
 from sklearn.pipeline import Pipeline
-from sklearn.model_selection import GridSearchCV
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401  Enables the halving searches
+from sklearn.model_selection import (
+    GridSearchCV, HalvingGridSearchCV, HalvingRandomSearchCV, RandomizedSearchCV,
+    KFold, ParameterGrid, ParameterSampler
+)
+from src.profiling import profile_stage
 
-def hyperparameter_tuning(model: Pipeline, X_train, y_train, param_grid: dict) -> Pipeline:
+STRATEGIES = ('grid', 'halving', 'random', 'bayesian')
+CV_FOLDS = 5
+N_JOBS = -1
+MIN_BATCH_SIZE = 8  # Candidates per GridSearchCV call of a batched search, whatever the core count
+
+class SearchSummary(NamedTuple):
+    """
+    Outcome of one search, independent of the strategy that produced it.
+    """
+    best_model: Pipeline
+    best_params: dict
+    best_score: float
+    n_fits: int         # Cross-validation fits, excluding the final refit
+    fits_to_best: int   # Fits spent until the best candidate had been evaluated
+    seconds_to_best: float  # Time spent until then
+
+def _fit_seconds(search, n_candidates: Optional[int] = None) -> float:
+    # Summed fit and score time of the first n_candidates rows of cv_results_,
+    # i.e. the search's cost when run on one core
+    results = search.cv_results_
+    times = np.asarray(results['mean_fit_time']) + np.asarray(results['mean_score_time'])
+    return float(times[:n_candidates].sum() * CV_FOLDS)
+
+def _summarize_search(search, n_fits: int, fits_to_best: int, seconds_to_best: float) -> SearchSummary:
+    return SearchSummary(search.best_estimator_, search.best_params_, search.best_score_,
+                         n_fits, fits_to_best, seconds_to_best)
+
+def _fits_per_candidate(search) -> SearchSummary:
+    # Grid, random and Bayesian searches evaluate every candidate on all folds, in order
+    n_fits = len(search.cv_results_['params']) * CV_FOLDS
+    n_to_best = search.best_index_ + 1
+    return _summarize_search(search, n_fits, n_to_best * CV_FOLDS, _fit_seconds(search, n_to_best))
+
+def _cv_splitter(cv_seed: Optional[int]):
+    # Unshuffled KFold unless a seed is given
+    return CV_FOLDS if cv_seed is None else KFold(CV_FOLDS, shuffle=True, random_state=cv_seed)
+
+def _candidate_key(params: dict) -> str:
+    return json.dumps(params, sort_keys=True, default=repr)
+
+class SearchResultStore:
+    """
+    Per-candidate cross-validation results that persist across runs.
+
+    Results are appended to one JSON-lines file per search context, keyed by
+    a hash of the training data, the CV splitter (including its seed) and the
+    pipeline definition. Any change to one of those starts a fresh file, so
+    stored fold scores are only reused where they are still valid. Each
+    evaluated batch of candidates is appended as soon as it finishes, so an
+    interrupted search resumes where it stopped.
+    """
+
+    def __init__(self, results_dir: str, model: Pipeline, X_train, y_train, cv):
+        """
+        Parameters:
+        - results_dir: Directory holding the result files.
+        - model: Pipeline being tuned; its unfitted definition is part of the key.
+        - X_train: Training features.
+        - y_train: Training target.
+        - cv: CV splitter or number of folds.
+        """
+        definition = clone(model)
+        if 'memory' in definition.get_params():
+            definition.set_params(memory=None)
+        key = joblib.hash([joblib.hash(X_train), joblib.hash(y_train), repr(cv), 'r2',
+                           joblib.hash(definition)])
+        os.makedirs(results_dir, exist_ok=True)
+        self.path = os.path.join(results_dir, f"search-{key}.jsonl")
+        self.results: Dict[str, dict] = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'rb+') as f:
+                content = f.read()
+                # Drop a partial last line left by an interrupted write
+                end = content.rfind(b'\n') + 1
+                if end < len(content):
+                    f.truncate(end)
+            for line in content[:end].splitlines():
+                record = json.loads(line)
+                self.results[record['key']] = record
+
+    def get(self, params: dict) -> Optional[dict]:
+        return self.results.get(_candidate_key(params))
+
+    def add(self, records: List[dict]) -> None:
+        """
+        Append evaluated candidates, each with 'params', 'fold_scores',
+        'mean_fit_time' and 'mean_score_time'.
+        """
+        with open(self.path, 'a') as f:
+            for record in records:
+                record = dict(record, key=_candidate_key(record['params']))
+                self.results[record['key']] = record
+                f.write(json.dumps(record, default=repr) + '\n')
+
+def _batched_search(model: Pipeline, candidates: List[dict], X_train, y_train, cv,
+                    time_budget: Optional[float] = None,
+                    store: Optional[SearchResultStore] = None, n_jobs: int = N_JOBS,
+                    verbose: int = 1) -> SearchSummary:
+    """
+    Evaluate candidates in small batches until they run out or the time budget is spent,
+    then refit the best one on the full training set.
+
+    With a store, candidates it already holds are not evaluated again, and
+    every finished batch is added to it. Fit counts in the summary only
+    include the fits run in this call.
     """
-    Perform hyperparameter tuning using GridSearchCV.
+    start = time.perf_counter()
+    # One GridSearchCV call per batch; a batch per core alone would mean one
+    # call, with its setup and CV splitting, per candidate on small hosts
+    batch_size = max(effective_n_jobs(n_jobs), MIN_BATCH_SIZE)
+    scores: Dict[str, float] = {}
+    fitted = set()  # Keys of the candidates evaluated in this call rather than reused
+    finished_at: Dict[str, float] = {}  # Seconds into the search at which each candidate's batch finished
+    pending = []
+    for candidate in candidates:
+        record = store.get(candidate) if store is not None else None
+        if record is not None:
+            scores[_candidate_key(candidate)] = float(np.mean(record['fold_scores']))
+        else:
+            pending.append(candidate)
+    if store is not None:
+        logging.info(f"Reusing {len(candidates) - len(pending)} of {len(candidates)} candidates "
+                     f"from {store.path}")
+
+    n_fits = 0
+    for i in range(0, len(pending), batch_size):
+        # The first batch always runs, so even a spent budget yields a result
+        if i > 0 and time_budget is not None and time.perf_counter() - start >= time_budget:
+            logging.info(f"Time budget of {time_budget:.1f}s reached after {n_fits // CV_FOLDS} candidates")
+            break
+        batch = [{name: [value] for name, value in candidate.items()}
+                 for candidate in pending[i:i + batch_size]]
+        search = GridSearchCV(model, batch, cv=cv, scoring='r2', n_jobs=n_jobs, refit=False, verbose=verbose)
+        search.fit(X_train, y_train)
+        results = search.cv_results_
+        records = []
+        for j, params in enumerate(results['params']):
+            fold_scores = [float(results[f"split{k}_test_score"][j]) for k in range(CV_FOLDS)]
+            scores[_candidate_key(params)] = float(results['mean_test_score'][j])
+            fitted.add(_candidate_key(params))
+            records.append({'params': params, 'fold_scores': fold_scores,
+                            'mean_fit_time': float(results['mean_fit_time'][j]),
+                            'mean_score_time': float(results['mean_score_time'][j])})
+        if store is not None:
+            store.add(records)
+        n_fits += len(records) * CV_FOLDS
+        batch_end = time.perf_counter() - start
+        finished_at.update((_candidate_key(record['params']), batch_end) for record in records)
+
+    # Best in candidate order among those evaluated, as GridSearchCV ranks ties
+    evaluated = [c for c in candidates if _candidate_key(c) in scores]
+    candidate_scores = np.array([scores[_candidate_key(c)] for c in evaluated])
+    if not np.isfinite(candidate_scores).any():
+        raise ValueError(f"None of the {len(evaluated)} evaluated candidates has a finite cross-validation "
+                         f"score; every fit failed or scored NaN")
+    best_index = int(np.nanargmax(candidate_scores))
+    best_params = evaluated[best_index]
+    best_model = clone(model).set_params(**best_params).fit(X_train, y_train)
+    if _candidate_key(best_params) not in fitted:
+        logging.info("The best candidate was reused from the store")
+    fits_to_best = sum(_candidate_key(c) in fitted for c in evaluated[:best_index + 1]) * CV_FOLDS
+    return SearchSummary(best_model, best_params, float(candidate_scores[best_index]),
+                         n_fits, fits_to_best, finished_at.get(_candidate_key(best_params), 0.0))
+
+def _halving_search(model: Pipeline, param_grid: dict, max_candidates: Optional[int], cv,
+                    random_state: int, n_jobs: int = N_JOBS, verbose: int = 1):
+    """
+    Unfitted successive halving search: over the full grid, or over a random
+    sample of it when the fits are budgeted.
+    """
+    # 'exhaust' sizes the first round so that the last one uses all rows. The
+    # random search would otherwise start from a handful of rows, too few for
+    # a finite R2 on every test fold, and drop candidates on NaN scores.
+    if max_candidates is None:
+        return HalvingGridSearchCV(
+            model, param_grid, cv=cv, scoring='r2', factor=3, min_resources='exhaust',
+            random_state=random_state, n_jobs=n_jobs, verbose=verbose
+        )
+    # Each halving round keeps a third of the candidates, so the rounds
+    # together cost at most 1.5x the fits of the first one
+    return HalvingRandomSearchCV(
+        model, param_grid, n_candidates=max(1, int(max_candidates / 1.5)), cv=cv,
+        scoring='r2', factor=3, min_resources='exhaust', random_state=random_state,
+        n_jobs=n_jobs, verbose=verbose
+    )
+
+def _run_search(model: Pipeline, X_train, y_train, param_grid: dict, strategy: str,
+                max_fits: Optional[int], time_budget: Optional[float],
+                n_iter: int, random_state: int, cv_seed: Optional[int] = None,
+                results_dir: Optional[str] = None, n_jobs: int = N_JOBS,
+                verbose: int = 1) -> SearchSummary:
+    cv = _cv_splitter(cv_seed)
+    max_candidates = None if max_fits is None else max(1, max_fits // CV_FOLDS)
+
+    if strategy in ('grid', 'random'):
+        if strategy == 'grid':
+            candidates = list(ParameterGrid(param_grid))
+            if max_candidates is not None and max_candidates < len(candidates):
+                # A truncated grid would only explore its first values; sample it instead
+                rng = np.random.RandomState(random_state)
+                candidates = [candidates[i] for i in rng.permutation(len(candidates))[:max_candidates]]
+        else:
+            n_candidates = n_iter if max_candidates is None else max_candidates
+            candidates = list(ParameterSampler(param_grid, n_candidates, random_state=random_state))
+
+        if time_budget is not None or results_dir is not None:
+            store = None if results_dir is None else SearchResultStore(results_dir, model, X_train, y_train, cv)
+            return _batched_search(model, candidates, X_train, y_train, cv, time_budget, store, n_jobs,
+                                   verbose=verbose)
+        if strategy == 'random':
+            search = RandomizedSearchCV(
+                model, param_grid, n_iter=len(candidates), cv=cv, scoring='r2',
+                random_state=random_state, n_jobs=n_jobs, verbose=verbose
+            )
+        elif max_candidates is None:
+            search = GridSearchCV(
+                model, param_grid, cv=cv, scoring='r2', n_jobs=n_jobs, verbose=verbose
+            )
+        else:
+            search = GridSearchCV(
+                model, [{name: [value] for name, value in c.items()} for c in candidates],
+                cv=cv, scoring='r2', n_jobs=n_jobs, verbose=verbose
+            )
+        search.fit(X_train, y_train)
+        return _fits_per_candidate(search)
+
+    if results_dir is not None:
+        raise ValueError(f"results_dir is only supported for the 'grid' and 'random' strategies, not '{strategy}'.")
+
+    if strategy == 'halving':
+        if time_budget is not None:
+            raise ValueError("time_budget is not supported for strategy 'halving'; use max_fits.")
+        search = _halving_search(model, param_grid, max_candidates, cv, random_state, n_jobs, verbose)
+        search.fit(X_train, y_train)
+        n_fits = sum(search.n_candidates_) * CV_FOLDS
+        # The best candidate is only known once the last round has finished
+        return _summarize_search(search, n_fits, n_fits, _fit_seconds(search))
+
+    # Bayesian optimization needs scikit-optimize, imported only when requested
+    try:
+        from skopt import BayesSearchCV
+        from skopt.callbacks import DeadlineStopper
+    except ImportError as e:
+        raise ImportError("strategy 'bayesian' requires scikit-optimize: pip install scikit-optimize") from e
+    search = BayesSearchCV(
+        model, param_grid, n_iter=n_iter if max_candidates is None else max_candidates,
+        cv=cv, scoring='r2', random_state=random_state, n_jobs=n_jobs, verbose=verbose
+    )
+    search.fit(X_train, y_train,
+               callback=None if time_budget is None else DeadlineStopper(time_budget))
+    return _fits_per_candidate(search)
+
+@profile_stage('tune')
+def hyperparameter_tuning(model: Pipeline, X_train, y_train, param_grid: dict,
+                          cache_preprocessing: bool = False,
+                          cache_dir: Optional[str] = None,
+                          strategy: str = 'grid',
+                          max_fits: Optional[int] = None,
+                          time_budget: Optional[float] = None,
+                          n_iter: int = 10,
+                          random_state: int = 42,
+                          cv_seed: Optional[int] = None,
+                          results_dir: Optional[str] = None,
+                          n_jobs: int = N_JOBS,
+                          verbose: int = 1) -> Pipeline:
+    """
+    Perform hyperparameter tuning using cross-validated search.
 
     Parameters:
     - model: Pipeline with a regressor.
     - X_train: Training features.
     - y_train: Training target.
     - param_grid: Dictionary with parameters names as keys and lists of parameter settings to try as values.
+    - cache_preprocessing: Cache the fitted preprocessing steps with joblib.Memory, so the
+      preprocessor is fit and applied once per fold instead of once per candidate and fold.
+      Only useful when param_grid does not tune the preprocessor itself.
+    - cache_dir: Directory for the cache. Defaults to a temporary directory that is
+      removed afterwards; pass a path to reuse the cache across runs.
+    - strategy: 'grid' (exhaustive GridSearchCV), 'halving' (successive halving on
+      the number of samples), 'random' (RandomizedSearchCV) or 'bayesian'
+      (BayesSearchCV, requires scikit-optimize).
+    - max_fits: Optional budget of cross-validation fits. Grid and random search
+      evaluate at most max_fits // 5 candidates; halving starts with fewer candidates.
+    - time_budget: Optional wall-clock budget in seconds. Grid and random search stop
+      scheduling new candidates once it is spent, but always evaluate the first
+      batch; Bayesian search stops between
+      iterations. Not supported for halving.
+    - n_iter: Number of candidates for random and Bayesian search without max_fits.
+    - random_state: Seed for candidate sampling.
+    - cv_seed: If set, folds are shuffled with this seed; by default they are
+      consecutive blocks of the training data.
+    - results_dir: Directory of a SearchResultStore for the 'grid' and 'random'
+      strategies. Fold scores of candidates evaluated in earlier runs on the
+      same data, folds and pipeline are reused, so extending param_grid only
+      evaluates the new candidates, and an interrupted search resumes.
+    - n_jobs: Number of worker processes for the search (-1 uses all cores).
+    - verbose: Verbosity of the underlying scikit-learn searches (0 silences them).
 
     Returns:
-    - Best estimator after GridSearchCV.
+    - Best estimator, refit on the full training set.
     """
-    logging.info("Starting hyperparameter tuning...")
+    if strategy not in STRATEGIES:
+        raise ValueError(f"strategy must be one of {STRATEGIES}, got '{strategy}'")
 
-    grid_search = GridSearchCV(
-        model, param_grid, cv=5, scoring='r2', n_jobs=-1, verbose=1
-    )
-    grid_search.fit(X_train, y_train)
+    logging.info(f"Starting hyperparameter tuning with the {strategy} strategy...")
+
+    temp_dir = None
+    if cache_preprocessing:
+        if cache_dir is None:
+            cache_dir = temp_dir = tempfile.mkdtemp(prefix='preprocessing_cache_')
+        model = clone(model).set_params(memory=Memory(cache_dir, verbose=0))
+        logging.info(f"Caching preprocessing steps in {cache_dir}")
+
+    try:
+        start = time.perf_counter()
+        summary = _run_search(model, X_train, y_train, param_grid, strategy,
+                              max_fits, time_budget, n_iter, random_state, cv_seed, results_dir, n_jobs,
+                              verbose)
+        elapsed = time.perf_counter() - start
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
-    logging.info(f"Best parameters: {grid_search.best_params_}")
-    logging.info(f"Best R2 Score: {grid_search.best_score_:.4f}")
+    logging.info(f"Best parameters: {summary.best_params}")
+    logging.info(f"Best R2 Score: {summary.best_score:.4f}")
+    logging.info(f"Hyperparameter tuning took {elapsed:.2f} seconds")
+    logging.info(f"Strategy '{strategy}' ran {summary.n_fits} fits; "
+                 f"best R2 reached after {summary.fits_to_best} fits and {summary.seconds_to_best:.2f} seconds")
 
-    best_model = grid_search.best_estimator_
+    best_model = summary.best_model
+    if cache_preprocessing:
+        # Detach the cache so the saved artifact does not reference it
+        best_model.set_params(memory=None)
     return best_model
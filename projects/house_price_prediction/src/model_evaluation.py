@@ -2,10 +2,122 @@
 
 import numpy as np
 import logging
-from typing import Dict
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from typing import Dict, Iterable, Optional, Tuple
+from src.profiling import profile_stage, set_stage_rows
 
-def evaluate_model(model, X_test, y_test) -> Dict[str, float]:
+class MetricsAccumulator:
+    """
+    One-pass, mergeable MAE, MSE, RMSE and R2 over chunks of predictions.
+
+    Absolute and squared errors are summed; the target's variance, needed for
+    R2, is tracked with Welford's update so chunks of any size can be combined,
+    including accumulators filled by different workers.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.abs_error_sum = 0.0
+        self.sq_error_sum = 0.0
+        self.target_mean = 0.0
+        self.target_m2 = 0.0
+
+    def update(self, y_true, y_pred) -> "MetricsAccumulator":
+        """
+        Add one chunk of targets and predictions.
+        """
+        y_true = np.asarray(y_true, dtype=np.float64).ravel()
+        y_pred = np.asarray(y_pred, dtype=np.float64).ravel()
+        n = len(y_true)
+        if n == 0:
+            return self
+        errors = y_true - y_pred
+        chunk_mean = y_true.mean()
+        deviations = y_true - chunk_mean
+        self._combine(n, float(np.abs(errors).sum()), float(errors @ errors),
+                      float(chunk_mean), float(deviations @ deviations))
+        return self
+
+    def merge(self, other: "MetricsAccumulator") -> "MetricsAccumulator":
+        """
+        Fold another accumulator into this one.
+        """
+        if other.count:
+            self._combine(other.count, other.abs_error_sum, other.sq_error_sum,
+                          other.target_mean, other.target_m2)
+        return self
+
+    def _combine(self, n: int, abs_error_sum: float, sq_error_sum: float, mean: float, m2: float) -> None:
+        total = self.count + n
+        delta = mean - self.target_mean
+        self.target_mean += delta * n / total
+        self.target_m2 += m2 + delta * delta * self.count * n / total
+        self.abs_error_sum += abs_error_sum
+        self.sq_error_sum += sq_error_sum
+        self.count = total
+
+    def result(self) -> Dict[str, float]:
+        """
+        Metrics over everything added so far, with the keys used by evaluate_model.
+        """
+        if self.count == 0:
+            raise ValueError("No predictions have been added.")
+        mse = self.sq_error_sum / self.count
+        # Same convention as sklearn's r2_score for a constant target
+        if self.target_m2 > 0:
+            r2 = 1.0 - self.sq_error_sum / self.target_m2
+        else:
+            r2 = 1.0 if self.sq_error_sum == 0 else 0.0
+        return {
+            'MAE': self.abs_error_sum / self.count,
+            'MSE': mse,
+            'RMSE': float(np.sqrt(mse)),
+            'R2_Score': r2
+        }
+
+def iter_test_chunks(X_test, y_test, chunk_size: Optional[int] = None) -> Iterable[Tuple[object, object]]:
+    """
+    Split in-memory test data into (X, y) chunks of at most `chunk_size` rows.
+
+    Parameters:
+    - X_test: Testing features (DataFrame or array).
+    - y_test: Testing target (Series or array).
+    - chunk_size: Rows per chunk; None yields the data as a single chunk.
+
+    Returns:
+    - Iterator over (X, y) pairs.
+    """
+    if chunk_size is None:
+        yield X_test, y_test
+        return
+    for start in range(0, len(y_test), chunk_size):
+        rows = slice(start, start + chunk_size)
+        X_chunk = X_test.iloc[rows] if hasattr(X_test, 'iloc') else X_test[rows]
+        y_chunk = y_test.iloc[rows] if hasattr(y_test, 'iloc') else y_test[rows]
+        yield X_chunk, y_chunk
+
+@profile_stage('evaluate')
+def evaluate_models(models: Dict[str, object], chunks: Iterable[Tuple[object, object]]) -> Dict[str, Dict[str, float]]:
+    """
+    Evaluate several models in a single pass over the test data.
+
+    Each chunk is read once and scored by every model, so hold-out sets larger
+    than memory can be streamed by splitting the target off load_data_chunks output.
+
+    Parameters:
+    - models: Dictionary of trained models.
+    - chunks: Iterable of (X, y) pairs.
+
+    Returns:
+    - Dictionary of evaluation metrics per model.
+    """
+    accumulators = {name: MetricsAccumulator() for name in models}
+    for X_chunk, y_chunk in chunks:
+        for name, model in models.items():
+            accumulators[name].update(y_chunk, model.predict(X_chunk))
+    set_stage_rows(next(iter(accumulators.values())).count if accumulators else 0)
+    return {name: accumulator.result() for name, accumulator in accumulators.items()}
+
+def evaluate_model(model, X_test, y_test, chunk_size: Optional[int] = None) -> Dict[str, float]:
     """
     Evaluate the model using various regression metrics.
 
@@ -13,21 +125,10 @@ def evaluate_model(model, X_test, y_test) -> Dict[str, float]:
     - model: Trained model.
     - X_test: Testing features.
     - y_test: Testing target.
+    - chunk_size: Optional number of rows predicted at a time, to bound memory.
 
     Returns:
     - Dictionary of evaluation metrics.
     """
-    predictions = model.predict(X_test)
-    mae = mean_absolute_error(y_test, predictions)
-    mse = mean_squared_error(y_test, predictions)
-    rmse = np.sqrt(mse)
-    r2 = r2_score(y_test, predictions)
-
-    metrics = {
-        'MAE': mae,
-        'MSE': mse,
-        'RMSE': rmse,
-        'R2_Score': r2
-    }
-
+    metrics = evaluate_models({'model': model}, iter_test_chunks(X_test, y_test, chunk_size))['model']
     return metrics
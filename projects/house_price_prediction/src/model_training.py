@@ -1,37 +1,237 @@
 # src/model_training.py
 
+import copy
 import logging
-from typing import Dict
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
 from sklearn.pipeline import Pipeline
-from sklearn.linear_model import LinearRegression
+from sklearn.linear_model import LinearRegression, SGDRegressor
+from sklearn.preprocessing import StandardScaler
 from sklearn.tree import DecisionTreeRegressor
+from src.data_loading import load_data_chunks
+from src.data_preprocessing import preprocess_data, split_features
+from src.profiling import profile_stage, set_stage_rows
 
-def train_models(X_train, y_train, preprocessor) -> Dict[str, Pipeline]:
+STREAMING_SOLVERS = ('ols', 'sgd')
+DEFAULT_STREAM_CHUNK_SIZE = 100_000
+DEFAULT_SAMPLE_SIZE = 100_000  # Rows kept to fit the imputers
+
+def get_regressors() -> Dict[str, object]:
+    """
+    Unfitted regressors trained by train_models, keyed by display name.
+    """
+    return {
+        'Linear Regression': LinearRegression(),
+        'Decision Tree': DecisionTreeRegressor(random_state=42)
+    }
+
+def _fit_regressor(regressor, X_transformed, y_train):
+    return regressor.fit(X_transformed, y_train)
+
+@profile_stage('train')
+def train_models(X_train, y_train, preprocessor, n_jobs: int = -1) -> Dict[str, Pipeline]:
     """
     Train different regression models using pipelines.
 
+    The preprocessor is fit and the training matrix transformed once; the
+    regressors are then fit on that matrix in parallel worker processes.
+    joblib memory-maps large arrays, so workers read the matrix without copying it.
+
     Parameters:
     - X_train: Training features.
     - y_train: Training target.
     - preprocessor: Preprocessing pipeline.
+    - n_jobs: Number of worker processes (-1 uses all cores).
 
     Returns:
-    - Dictionary of trained models.
-    """
-    models = {
-        'Linear Regression': Pipeline(steps=[
-            ('preprocessor', preprocessor),
-            ('regressor', LinearRegression())
-        ]),
-        'Decision Tree': Pipeline(steps=[
-            ('preprocessor', preprocessor),
-            ('regressor', DecisionTreeRegressor(random_state=42))
-        ])
-    }
+    - Dictionary of trained models. Each pipeline holds its own copy of the
+      fitted preprocessor, so they can be pickled and used independently.
+    """
+    logging.info("Fitting the shared preprocessor...")
+    fitted_preprocessor = clone(preprocessor).fit(X_train, y_train)
+    X_transformed = fitted_preprocessor.transform(X_train)
+
+    regressors = get_regressors()
+    logging.info(f"Training {', '.join(regressors)}...")
+    fitted = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_regressor)(regressor, X_transformed, y_train)
+        for regressor in regressors.values()
+    )
 
-    for name, pipeline in models.items():
-        logging.info(f"Training {name}...")
-        pipeline.fit(X_train, y_train)
+    models = {}
+    for name, regressor in zip(regressors, fitted):
+        models[name] = Pipeline(steps=[
+            ('preprocessor', copy.deepcopy(fitted_preprocessor)),
+            ('regressor', regressor)
+        ])
         logging.info(f"{name} trained successfully.")
 
     return models
+
+class _CenteredGram:
+    """
+    Sufficient statistics for least squares, accumulated chunk by chunk: the
+    means of the features and target and their centered cross products,
+    combined across chunks with Chan's parallel update.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.z_mean = self.y_mean = None
+        self.zz = self.zy = None
+
+    def update(self, Z: np.ndarray, y: np.ndarray) -> None:
+        Z = np.asarray(Z, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        n = len(y)
+        if n == 0:
+            return
+        z_mean, y_mean = Z.mean(axis=0), y.mean()
+        Zc, yc = Z - z_mean, y - y_mean
+        zz, zy = Zc.T @ Zc, Zc.T @ yc
+        if self.count == 0:
+            self.count, self.z_mean, self.y_mean, self.zz, self.zy = n, z_mean, y_mean, zz, zy
+            return
+        total = self.count + n
+        weight = self.count * n / total
+        dz, dy = z_mean - self.z_mean, y_mean - self.y_mean
+        self.zz = self.zz + zz + weight * np.outer(dz, dz)
+        self.zy = self.zy + zy + weight * dz * dy
+        self.z_mean = self.z_mean + dz * n / total
+        self.y_mean = self.y_mean + dy * n / total
+        self.count = total
+
+    def to_linear_regression(self) -> LinearRegression:
+        """
+        Fitted LinearRegression equal to fitting on all rows at once.
+
+        Like LinearRegression.fit, this takes the minimum-norm solution, so
+        collinear one-hot columns get the same coefficients.
+        """
+        coef, _, rank, _ = np.linalg.lstsq(self.zz, self.zy, rcond=None)
+        regressor = LinearRegression()
+        regressor.coef_ = coef
+        regressor.intercept_ = float(self.y_mean - self.z_mean @ coef)
+        regressor.n_features_in_ = len(coef)
+        regressor.rank_ = int(rank)
+        # Singular values of the centered design matrix
+        regressor.singular_ = np.sqrt(np.clip(np.linalg.eigvalsh(self.zz)[::-1], 0, None))
+        return regressor
+
+def _sample_rows(sample: Optional[pd.DataFrame], keys: Optional[np.ndarray], chunk: pd.DataFrame,
+                 rng: np.random.Generator, sample_size: int):
+    # Keep the rows with the smallest random keys seen so far: a uniform
+    # sample of the whole file that never holds more than sample_size + chunk rows
+    chunk_keys = rng.random(len(chunk))
+    if sample is None:
+        sample, keys = chunk, chunk_keys
+    else:
+        sample = pd.concat([sample, chunk], ignore_index=True)
+        keys = np.concatenate([keys, chunk_keys])
+    if len(keys) > sample_size:
+        keep = np.argpartition(keys, sample_size)[:sample_size]
+        sample, keys = sample.iloc[keep].reset_index(drop=True), keys[keep]
+    return sample, keys
+
+def _branch_columns(preprocessor, name: str) -> List[str]:
+    for branch, _, columns in preprocessor.transformers:
+        if branch == name:
+            return list(columns)
+    return []
+
+@profile_stage('train')
+def train_model_streaming(filepath: str, chunksize: int = DEFAULT_STREAM_CHUNK_SIZE,
+                          dtype: Optional[Dict[str, str]] = None, solver: str = 'ols',
+                          sample_size: int = DEFAULT_SAMPLE_SIZE, epochs: int = 5,
+                          compact: bool = False, random_state: int = 42) -> Pipeline:
+    """
+    Train a linear model on a CSV without loading it into memory.
+
+    The file is read in chunks of `chunksize` rows, three times over:
+    1. Collect every category of the categorical columns and a uniform random
+       sample of `sample_size` rows. The imputers are fit on the sample, so
+       the medians are estimates once the file has more rows than that.
+    2. Fit the StandardScaler with partial_fit on the imputed chunks.
+    3. Fit the regressor. 'ols' accumulates X^T X and X^T y and solves them
+       exactly like LinearRegression. 'sgd' runs SGDRegressor.partial_fit
+       over the chunks for `epochs` passes, in file order.
+
+    Memory is bounded by the chunk size and the sample size, not the file size.
+
+    Parameters:
+    - filepath: Path to the CSV file.
+    - chunksize: Rows read at a time.
+    - dtype: Optional column dtypes, e.g. BOSTON_DTYPES.
+    - solver: 'ols' or 'sgd'.
+    - sample_size: Rows sampled to fit the imputers.
+    - epochs: Passes over the data for 'sgd'.
+    - compact: Build the preprocessor with preprocess_data(compact=True).
+    - random_state: Seed for the sample and for SGD.
+
+    Returns:
+    - Fitted Pipeline of the same form as train_models produces, which can be
+      passed to save_model and used by predict.py and the server.
+    """
+    if solver not in STREAMING_SOLVERS:
+        raise ValueError(f"solver must be one of {STREAMING_SOLVERS}, got '{solver}'")
+
+    def chunks():
+        for chunk in load_data_chunks(filepath, chunksize, dtype=dtype):
+            yield split_features(chunk)
+
+    # Pass 1: categories and a sample for the imputers
+    rng = np.random.default_rng(random_state)
+    sample = keys = preprocessor = None
+    categories: Dict[str, set] = {}
+    n_rows = 0
+    for X, y in chunks():
+        if preprocessor is None:
+            _, _, preprocessor = preprocess_data(pd.concat([X, y], axis=1).head(1), compact=compact)
+            cat_columns = _branch_columns(preprocessor, 'cat')
+            num_columns = _branch_columns(preprocessor, 'num')
+            categories = {column: set() for column in cat_columns}
+        for column in cat_columns:
+            categories[column].update(X[column].dropna().unique().tolist())
+        sample, keys = _sample_rows(sample, keys, pd.concat([X, y], axis=1), rng, sample_size)
+        n_rows += len(y)
+    if preprocessor is None:
+        raise ValueError(f"No rows found in {filepath}")
+    logging.info(f"Streaming pass 1: {n_rows} rows, imputers fit on a sample of {len(sample)}")
+
+    if cat_columns:
+        # Every category in the file, not only those in the sample
+        preprocessor.set_params(cat__onehot__categories=[np.array(sorted(categories[c])) for c in cat_columns])
+    X_sample, y_sample = split_features(sample)
+    preprocessor.fit(X_sample, y_sample)
+
+    # Pass 2: exact scaler statistics over the imputed data
+    if num_columns:
+        numerical = preprocessor.named_transformers_['num']
+        imputer = numerical.named_steps['imputer']
+        scaler = clone(numerical.named_steps['scaler'])
+        for X, _ in chunks():
+            scaler.partial_fit(imputer.transform(X[num_columns]))
+        numerical.steps[-1] = ('scaler', scaler)
+    logging.info("Streaming pass 2: scaler fit")
+
+    # Pass 3: the regressor
+    if solver == 'ols':
+        gram = _CenteredGram()
+        for X, y in chunks():
+            gram.update(preprocessor.transform(X), y.to_numpy())
+        regressor = gram.to_linear_regression()
+    else:
+        regressor = SGDRegressor(random_state=random_state)
+        for _ in range(epochs):
+            for X, y in chunks():
+                regressor.partial_fit(preprocessor.transform(X), y.to_numpy())
+    logging.info(f"Streaming pass 3: {type(regressor).__name__} fit on {n_rows} rows")
+
+    set_stage_rows(n_rows)
+    return Pipeline(steps=[
+        ('preprocessor', preprocessor),
+        ('regressor', regressor)
+    ])
@@ -1,9 +1,21 @@
 # src/predict.py
 
+import os
 import sys
 import logging
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Iterator, Union
 from src.utils import load_model
-import pandas as pd
+
+# numpy and pandas are imported where they are used, so scoring a single row
+# with a compiled model never imports pandas
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 10_000  # Rows scored per model.predict call
+
+PredictionInput = Union['pd.DataFrame', str, os.PathLike, Iterable[dict]]
 
 def make_prediction(model_path: str, input_data: dict) -> float:
     """
@@ -18,14 +30,100 @@ def make_prediction(model_path: str, input_data: dict) -> float:
     """
     try:
         model = load_model(model_path)
-        input_df = pd.DataFrame([input_data])
-        predicted_price = model.predict(input_df)[0]
+        if hasattr(model, 'predict_one'):
+            # Compiled model: scores the dictionary directly
+            predicted_price = model.predict_one(input_data)
+        else:
+            import pandas as pd
+            input_df = pd.DataFrame([input_data])
+            predicted_price = model.predict(input_df)[0]
         logging.info(f"Predicted Price: {predicted_price:.2f} (in $1000's)")
         return predicted_price
     except Exception as e:
         logging.error(f"An error occurred during prediction: {e}")
         raise e
 
+def iter_input_chunks(data: PredictionInput, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator['pd.DataFrame']:
+    """
+    Split prediction input into DataFrame chunks of at most `chunk_size` rows.
+
+    Files are read lazily, so only one chunk is held in memory at a time.
+
+    Parameters:
+    - data: DataFrame, path to a CSV/Parquet file, or iterable of feature dictionaries.
+    - chunk_size: Maximum number of rows per chunk.
+
+    Returns:
+    - Iterator over DataFrame chunks.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+    import pandas as pd
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), chunk_size):
+            yield data.iloc[start:start + chunk_size]
+    elif isinstance(data, (str, os.PathLike)):
+        path = os.fspath(data)
+        if path.endswith('.parquet'):
+            try:
+                import pyarrow.parquet as pq  # Optional dependency, only needed for Parquet input
+            except ImportError as e:
+                raise ImportError("Parquet input requires pyarrow: pip install pyarrow") from e
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(path, chunksize=chunk_size)
+    else:
+        records = iter(data)
+        while True:
+            batch = list(islice(records, chunk_size))
+            if not batch:
+                break
+            yield pd.DataFrame.from_records(batch)
+
+def predict_stream(model_path: str, data: PredictionInput,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator['np.ndarray']:
+    """
+    Score input in chunks, loading the model only once.
+
+    Parameters:
+    - model_path: Path to the saved model file.
+    - data: DataFrame, path to a CSV/Parquet file, or iterable of feature dictionaries.
+    - chunk_size: Maximum number of rows per model.predict call.
+
+    Returns:
+    - Iterator yielding one array of predicted prices per chunk.
+    """
+    model = load_model(model_path)
+    total_rows = 0
+    for chunk in iter_input_chunks(data, chunk_size):
+        predictions = model.predict(chunk)
+        total_rows += len(predictions)
+        yield predictions
+    logging.info(f"Scored {total_rows} rows in chunks of up to {chunk_size}")
+
+def predict_batch(model_path: str, data: PredictionInput,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'np.ndarray':
+    """
+    Score all input rows and return the predictions as a single array.
+
+    Parameters:
+    - model_path: Path to the saved model file.
+    - data: DataFrame, path to a CSV/Parquet file, or iterable of feature dictionaries.
+    - chunk_size: Maximum number of rows per model.predict call.
+
+    Returns:
+    - Array of predicted prices, in input order.
+    """
+    import numpy as np
+    try:
+        chunks = list(predict_stream(model_path, data, chunk_size))
+        return np.concatenate(chunks) if chunks else np.empty(0)
+    except Exception as e:
+        logging.error(f"An error occurred during batch prediction: {e}")
+        raise e
+
 if __name__ == "__main__":
     # Example usage:
     # python src/predict.py
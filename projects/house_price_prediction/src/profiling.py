@@ -0,0 +1,179 @@
+# src/profiling.py
+
+import functools
+import json
+import logging
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+_active_profiler: Optional["StageProfiler"] = None
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 1024
+
+def _row_count(value) -> Optional[int]:
+    shape = getattr(value, 'shape', None)
+    return int(shape[0]) if shape else None
+
+class StageProfiler:
+    """
+    Record wall time, CPU time, memory and row counts per pipeline stage.
+
+    Stages are entered with the `stage` context manager or, for src functions
+    decorated with `profile_stage`, automatically while the profiler is active.
+    Nested stages are recorded with their parent's name, and a parent's
+    traced peak includes the peaks of its children.
+
+    `peak_rss_mb` is the high-water mark of this process (RUSAGE_SELF). Work
+    done in joblib or process-pool workers is not included, and since the
+    mark never goes down, a stage only shows growth above earlier stages.
+    """
+
+    def __init__(self, trace_memory: bool = False, cprofile_dir: Optional[str] = None):
+        """
+        Parameters:
+        - trace_memory: Also record the tracemalloc peak of each stage. Slows
+          allocation-heavy code noticeably.
+        - cprofile_dir: If set, write a cProfile dump per top-level stage to this directory.
+        """
+        self.trace_memory = trace_memory
+        self.cprofile_dir = cprofile_dir
+        self.stages: List[Dict] = []
+        self._stack: List[Dict] = []
+        # Absolute traced peak per running stage, saved before a child resets it
+        self._traced_peaks: List[int] = []
+        self._started = time.time()
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None):
+        """
+        Profile the enclosed block as one stage.
+
+        Yields the stage record; set record['rows'] inside the block if the row
+        count is only known there.
+        """
+        record = {'stage': name, 'parent': self._stack[-1]['stage'] if self._stack else None, 'rows': rows}
+        top_level = not self._stack
+        self._stack.append(record)
+
+        # cProfile and tracemalloc are only imported when requested, since
+        # every src module imports this one
+        profiler = None
+        if self.cprofile_dir and top_level:
+            import cProfile
+            profiler = cProfile.Profile()
+        if self.trace_memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            if self._traced_peaks:
+                self._traced_peaks[-1] = max(self._traced_peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+            self._traced_peaks.append(traced_before)
+
+        rss_before = _peak_rss_mb()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            record['wall_seconds'] = time.perf_counter() - wall_start
+            record['cpu_seconds'] = time.process_time() - cpu_start
+            record['peak_rss_mb'] = _peak_rss_mb()
+            record['peak_rss_growth_mb'] = record['peak_rss_mb'] - rss_before
+            if self.trace_memory:
+                traced_peak = max(self._traced_peaks.pop(), tracemalloc.get_traced_memory()[1])
+                record['traced_peak_mb'] = (traced_peak - traced_before) / 2**20
+                if self._traced_peaks:
+                    self._traced_peaks[-1] = max(self._traced_peaks[-1], traced_peak)
+            if profiler is not None:
+                os.makedirs(self.cprofile_dir, exist_ok=True)
+                path = os.path.join(self.cprofile_dir, f"{len(self.stages):02d}_{name}.prof")
+                profiler.dump_stats(path)
+                record['cprofile'] = path
+            self._stack.pop()
+            self.stages.append(record)
+            logging.info(f"Stage '{name}' took {record['wall_seconds']:.2f}s wall, "
+                         f"{record['cpu_seconds']:.2f}s CPU, peak RSS {record['peak_rss_mb']:.0f} MB")
+
+    def activate(self) -> "StageProfiler":
+        """
+        Make this the profiler used by functions decorated with profile_stage.
+        """
+        global _active_profiler
+        _active_profiler = self
+        return self
+
+    def deactivate(self) -> None:
+        global _active_profiler
+        if _active_profiler is self:
+            _active_profiler = None
+
+    def report(self) -> Dict:
+        """
+        Machine-readable summary of the run.
+        """
+        return {
+            'started': self._started,
+            'total_wall_seconds': sum(s['wall_seconds'] for s in self.stages if s['parent'] is None),
+            'trace_memory': self.trace_memory,
+            'stages': self.stages
+        }
+
+    def write_report(self, path: str) -> None:
+        """
+        Write the run report as JSON.
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        logging.info(f"Run report written to {path}")
+
+def current_profiler() -> Optional[StageProfiler]:
+    """
+    The active StageProfiler, or None.
+    """
+    return _active_profiler
+
+def set_stage_rows(rows: int) -> None:
+    """
+    Record the row count of the innermost running stage, for stages whose
+    inputs have no `shape` (e.g. iterators of chunks).
+    """
+    profiler = _active_profiler
+    if profiler is not None and profiler._stack:
+        profiler._stack[-1]['rows'] = int(rows)
+
+def profile_stage(name: str):
+    """
+    Decorator recording each call of a function as a stage of the active
+    StageProfiler; a no-op when no profiler is active.
+
+    The row count is taken from the first positional argument with a `shape`,
+    or otherwise from the return value.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active_profiler
+            if profiler is None:
+                return func(*args, **kwargs)
+            rows = next((r for r in map(_row_count, args) if r is not None), None)
+            with profiler.stage(name, rows=rows) as record:
+                result = func(*args, **kwargs)
+                if record['rows'] is None:
+                    record['rows'] = _row_count(result[0] if isinstance(result, tuple) else result)
+            return result
+        return wrapper
+    return decorator
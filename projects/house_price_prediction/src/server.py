@@ -0,0 +1,262 @@
+# src/server.py
+#
+# Minimal asyncio HTTP inference server with dynamic micro-batching.
+# Run from the project root:
+#     python -m src.server --port 8000 --max-batch-size 64 --max-wait-ms 5
+
+import argparse
+import asyncio
+import json
+import logging
+from typing import List, Optional, Tuple
+from src.utils import load_model
+
+DEFAULT_MODEL_PATH = 'models/best_decision_tree_model.joblib'
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+
+class MicroBatcher:
+    """
+    Queue single-row prediction requests and score them together.
+
+    A batch is flushed as one vectorized model.predict call as soon as it
+    holds `max_batch_size` rows or `max_wait_ms` milliseconds have passed
+    since its first row arrived. A `max_batch_size` of 1 disables batching.
+    """
+
+    def __init__(self, model, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be positive, got {max_batch_size}")
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.feature_names = list(getattr(model, 'feature_names_in_', []))
+        # Compiled models score plain rows; pipelines need a DataFrame, so
+        # pandas is only imported for them
+        if hasattr(model, 'predict_columns'):
+            self._score = lambda rows: model.predict([[row[name] for name in self.feature_names] for row in rows])
+        else:
+            import pandas as pd
+            self._score = lambda rows: model.predict(pd.DataFrame.from_records(rows))
+        self.batches_flushed = 0
+        self.rows_scored = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """
+        Start the background task that drains the queue. Must be called from a running event loop.
+        """
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Cancel the background task.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, row: dict) -> float:
+        """
+        Enqueue one row and wait for its prediction.
+        """
+        if not isinstance(row, dict):
+            raise ValueError(f"Expected a feature dictionary, got {type(row).__name__}")
+        missing = [name for name in self.feature_names if name not in row]
+        if missing:
+            raise ValueError(f"Missing features: {missing}")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    async def _collect_batch(self) -> List[Tuple[dict, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without waiting
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+            rows = [row for row, _ in batch]
+            try:
+                # Score off the event loop so new requests keep being accepted
+                predictions = await loop.run_in_executor(None, self._score, rows)
+            except Exception as e:
+                logging.error(f"An error occurred during batch prediction: {e}")
+                # Retry row by row so one malformed request does not fail its neighbours
+                for row, future in batch:
+                    if future.done():
+                        continue
+                    try:
+                        prediction = (await loop.run_in_executor(None, self._score, [row]))[0]
+                    except Exception as row_error:
+                        future.set_exception(row_error)
+                        continue
+                    self.batches_flushed += 1
+                    self.rows_scored += 1
+                    if not future.done():
+                        future.set_result(float(prediction))
+                continue
+            self.batches_flushed += 1
+            self.rows_scored += len(rows)
+            for (_, future), prediction in zip(batch, predictions):
+                if not future.done():
+                    future.set_result(float(prediction))
+
+class InferenceServer:
+    """
+    HTTP/1.1 server exposing the model behind a MicroBatcher.
+
+    Endpoints:
+    - POST /predict: body is one feature dictionary, answered with
+      {"prediction": float}, or a list of them, answered with {"predictions": [...]}.
+    - GET /health: batching statistics.
+    """
+
+    def __init__(self, batcher: MicroBatcher):
+        self.batcher = batcher
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                    if not request_line:
+                        break
+                    method, path, headers, body = await self._read_request(request_line, reader)
+                except ValueError as e:
+                    # The request cannot be framed, so the connection is closed after the answer
+                    await self._write_response(writer, '400 Bad Request', {'error': f"Malformed request: {e}"},
+                                               keep_alive=False)
+                    break
+
+                status, payload = await self.dispatch(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(request_line: bytes, reader: asyncio.StreamReader) -> Tuple[str, str, dict, bytes]:
+        method, path, _ = request_line.decode('latin-1').split(' ', 2)
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        body = b''
+        length = int(headers.get('content-length', 0))
+        if length < 0:
+            raise ValueError(f"Content-Length must not be negative, got {length}")
+        if length:
+            body = await reader.readexactly(length)
+        return method, path, headers, body
+
+    @staticmethod
+    async def _write_response(writer: asyncio.StreamWriter, status: str, payload: dict, keep_alive: bool) -> None:
+        data = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+        )
+        await writer.drain()
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Tuple[str, dict]:
+        if method == 'GET' and path == '/health':
+            return '200 OK', {
+                'status': 'ok',
+                'batches_flushed': self.batcher.batches_flushed,
+                'rows_scored': self.batcher.rows_scored
+            }
+        if method != 'POST' or path != '/predict':
+            return '404 Not Found', {'error': f"No route for {method} {path}"}
+
+        try:
+            request = json.loads(body)
+        except json.JSONDecodeError as e:
+            return '400 Bad Request', {'error': f"Invalid JSON: {e}"}
+
+        try:
+            if isinstance(request, list):
+                predictions = await asyncio.gather(*(self.batcher.predict(row) for row in request))
+                return '200 OK', {'predictions': list(predictions)}
+            return '200 OK', {'prediction': await self.batcher.predict(request)}
+        except ValueError as e:
+            return '400 Bad Request', {'error': str(e)}
+        except Exception as e:
+            return '500 Internal Server Error', {'error': str(e)}
+
+async def serve(model_path: str, host: str, port: int,
+                max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                max_wait_ms: float = DEFAULT_MAX_WAIT_MS) -> None:
+    """
+    Load the model and serve predictions until cancelled.
+
+    Parameters:
+    - model_path: Path to the saved model file.
+    - host: Interface to bind.
+    - port: Port to bind.
+    - max_batch_size: Maximum rows per model.predict call (1 disables batching).
+    - max_wait_ms: Maximum time a row waits for its batch to fill.
+    """
+    model = load_model(model_path)
+    batcher = MicroBatcher(model, max_batch_size, max_wait_ms)
+    batcher.start()
+    server = await asyncio.start_server(InferenceServer(batcher).handle_connection, host, port)
+    logging.info(f"Serving {model_path} on http://{host}:{port} "
+                 f"(max_batch_size={max_batch_size}, max_wait_ms={max_wait_ms})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the house price model over HTTP.")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help="Rows per model.predict call; 1 disables batching.")
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="Maximum time a request waits for its batch to fill.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s:%(message)s')
+    try:
+        asyncio.run(serve(args.model, args.host, args.port, args.max_batch_size, args.max_wait_ms))
+    except KeyboardInterrupt:
+        logging.info("Server stopped.")
+
+if __name__ == "__main__":
+    main()
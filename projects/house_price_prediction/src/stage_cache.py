@@ -0,0 +1,122 @@
+# src/stage_cache.py
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import joblib
+from typing import Callable, Dict, Iterable, Optional, Sequence
+from src.profiling import current_profiler
+
+_code_versions: Dict[str, str] = {}
+
+def code_version(func: Callable) -> str:
+    """
+    SHA-256 of the source file defining `func`, so editing a stage's module
+    invalidates its cached outputs. Decorators made with functools.wraps
+    (such as profile_stage) are looked through to the wrapped function.
+    """
+    path = inspect.getsourcefile(inspect.unwrap(func))
+    if path not in _code_versions:
+        with open(path, 'rb') as f:
+            _code_versions[path] = hashlib.sha256(f.read()).hexdigest()
+    return _code_versions[path]
+
+def _json_default(value):
+    # Parameters that JSON cannot express (dtypes, estimators) are keyed by repr
+    return repr(value)
+
+class StageCache:
+    """
+    Content-addressed cache of pipeline stage outputs.
+
+    A stage's key hashes its name, the source of the module defining its
+    function, its keyword parameters, the keys of the stages it depends on and
+    any extra data hashes (e.g. of an input file). Since keys chain through
+    `depends`, changing the data or an upstream stage reruns everything
+    downstream of it, while a change confined to one stage (say the tuning
+    grid) reruns only that stage and its dependents.
+
+    Outputs are pickled with joblib to `cache_dir/<stage>/<key>.joblib`.
+    """
+
+    def __init__(self, cache_dir: str, force: Iterable[str] = (), enabled: bool = True):
+        """
+        Parameters:
+        - cache_dir: Directory holding the cached outputs.
+        - force: Stage names to recompute even if cached; 'all' forces every stage.
+        - enabled: If False, every stage runs and nothing is written.
+        """
+        self.cache_dir = cache_dir
+        self.force = set(force)
+        self.enabled = enabled
+        self.keys: Dict[str, str] = {}
+
+    def stage_key(self, name: str, func: Callable, params: dict,
+                  depends: Sequence[str] = (), data: Sequence[str] = ()) -> str:
+        """
+        Compute the cache key of a stage.
+        """
+        missing = [stage for stage in depends if stage not in self.keys]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on stages that have not run: {missing}")
+        description = {
+            'stage': name,
+            'function': f"{func.__module__}.{func.__qualname__}",
+            'code': code_version(func),
+            'params': params,
+            'depends': {stage: self.keys[stage] for stage in depends},
+            'data': list(data)
+        }
+        encoded = json.dumps(description, sort_keys=True, default=_json_default).encode()
+        return hashlib.sha256(encoded).hexdigest()[:20]
+
+    def _path(self, name: str, key: str) -> str:
+        return os.path.join(self.cache_dir, name, f"{key}.joblib")
+
+    def run(self, name: str, func: Callable, *args, depends: Sequence[str] = (),
+            data: Sequence[str] = (), store: bool = True, **kwargs):
+        """
+        Run a stage, or load its output if an entry with the same key exists.
+
+        Positional arguments are not hashed: they must be described by
+        `depends` (outputs of earlier stages) or `data` (content hashes).
+        Keyword arguments are hashed as the stage's parameters.
+
+        Parameters:
+        - name: Stage name, as used by `force`.
+        - func: Function computing the stage.
+        - depends: Names of earlier stages whose outputs are passed in.
+        - data: Extra content hashes the output depends on.
+        - store: If False, only the key is recorded and the stage always runs,
+          for stages cheaper to recompute than to load.
+
+        Returns:
+        - The stage output.
+        """
+        key = self.stage_key(name, func, kwargs, depends, data)
+        self.keys[name] = key
+        path = self._path(name, key)
+        forced = name in self.force or 'all' in self.force
+
+        if self.enabled and store and not forced and os.path.exists(path):
+            profiler = current_profiler()
+            if profiler is not None:
+                with profiler.stage(name) as record:
+                    output = joblib.load(path)
+                    record['cached'] = True
+            else:
+                output = joblib.load(path)
+            logging.info(f"Stage '{name}' is up to date; loaded {path}")
+            return output
+
+        output = func(*args, **kwargs)
+        if self.enabled and store:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            joblib.dump(output, tmp_path)
+            # Atomic rename so an interrupted run never leaves a partial entry
+            os.replace(tmp_path, path)
+            logging.info(f"Stage '{name}' output cached to {path}")
+        return output
@@ -0,0 +1,137 @@
+# src/streaming_stats.py
+
+import numpy as np
+import pandas as pd
+from typing import Iterable, List, Optional
+
+class CorrelationAccumulator:
+    """
+    One-pass, mergeable covariance and correlation over chunks of rows.
+
+    Matches DataFrame.corr()/cov(): missing values are handled pairwise, so
+    every column pair keeps its own count, means and co-moments. Chunks are
+    combined with the parallel variant of Welford's update (Chan et al.),
+    which stays numerically stable without ever holding the full dataset.
+    Accumulators fed in different processes can be combined with merge().
+
+    State per column pair (i, j), over the rows where both are present:
+    - count[i, j]: number of rows
+    - mean[i, j]: mean of column i
+    - m2[i, j]: sum of squared deviations of column i
+    - comoment[i, j]: sum of products of deviations of columns i and j
+    """
+
+    def __init__(self, columns: Optional[List[str]] = None):
+        self.columns = list(columns) if columns is not None else None
+        self.count = self.mean = self.m2 = self.comoment = None
+        if self.columns is not None:
+            self._init_state(len(self.columns))
+
+    def _init_state(self, k: int) -> None:
+        self.count = np.zeros((k, k))
+        self.mean = np.zeros((k, k))
+        self.m2 = np.zeros((k, k))
+        self.comoment = np.zeros((k, k))
+
+    def update(self, chunk: pd.DataFrame) -> "CorrelationAccumulator":
+        """
+        Add a chunk of rows. The first chunk fixes the columns (numeric ones
+        only) unless they were given to the constructor.
+        """
+        if self.columns is None:
+            self.columns = chunk.select_dtypes(include='number').columns.tolist()
+            self._init_state(len(self.columns))
+
+        values = chunk[self.columns].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        weights = valid.astype(np.float64)
+
+        # Shift by the chunk's column means so the in-chunk sums stay small
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shift = np.nanmean(values, axis=0) if len(values) else np.zeros(len(self.columns))
+        shift = np.nan_to_num(shift)
+        shifted = np.where(valid, values - shift, 0.0)
+
+        count = weights.T @ weights                  # [i, j]: rows where i and j are present
+        sums = shifted.T @ weights                   # [i, j]: sum of column i over those rows
+        squares = (shifted * shifted).T @ weights    # [i, j]: sum of squares of column i over those rows
+        products = shifted.T @ shifted               # [i, j]: sum of products over those rows
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, sums / count, 0.0)
+            m2 = np.where(count > 0, squares - sums * mean, 0.0)
+            comoment = np.where(count > 0, products - sums * sums.T / count, 0.0)
+
+        self._combine(count, mean + shift[:, None], m2, comoment)
+        return self
+
+    def merge(self, other: "CorrelationAccumulator") -> "CorrelationAccumulator":
+        """
+        Fold another accumulator over the same columns into this one.
+        """
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self.columns = list(other.columns)
+            self._init_state(len(self.columns))
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge accumulators over different columns.")
+        self._combine(other.count, other.mean, other.m2, other.comoment)
+        return self
+
+    def _combine(self, count: np.ndarray, mean: np.ndarray, m2: np.ndarray, comoment: np.ndarray) -> None:
+        total = self.count + count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fraction = np.where(total > 0, count / total, 0.0)
+            weight = np.where(total > 0, self.count * count / total, 0.0)
+        delta = mean - self.mean
+        self.mean = self.mean + delta * fraction
+        self.m2 = self.m2 + m2 + delta * delta * weight
+        self.comoment = self.comoment + comoment + delta * delta.T * weight
+        self.count = total
+
+    def covariance(self, ddof: int = 1) -> pd.DataFrame:
+        """
+        Pairwise covariance matrix, like DataFrame.cov().
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = np.where(self.count > ddof, self.comoment / (self.count - ddof), np.nan)
+        return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+
+    def correlation(self) -> pd.DataFrame:
+        """
+        Pairwise Pearson correlation matrix, like DataFrame.corr().
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = self.comoment / np.sqrt(self.m2 * self.m2.T)
+        corr = np.where(self.count > 1, np.clip(corr, -1.0, 1.0), np.nan)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+def streaming_correlation(chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Correlation matrix of a sequence of chunks, holding one chunk at a time.
+
+    Parameters:
+    - chunks: Iterable of DataFrames, e.g. from load_data_chunks.
+
+    Returns:
+    - Correlation matrix of the numeric columns.
+    """
+    accumulator = CorrelationAccumulator()
+    for chunk in chunks:
+        accumulator.update(chunk)
+    return accumulator.correlation()
+
+def top_correlated_features(corr: pd.DataFrame, target: str, n: int = 10) -> pd.Series:
+    """
+    Features most strongly correlated with the target, by absolute correlation.
+
+    Parameters:
+    - corr: Correlation matrix.
+    - target: Target column name.
+    - n: Number of features to return.
+
+    Returns:
+    - Absolute correlations, sorted in descending order, excluding the target itself.
+    """
+    return corr[target].drop(target).abs().sort_values(ascending=False).head(n)
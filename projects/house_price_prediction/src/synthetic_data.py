@@ -0,0 +1,141 @@
+# src/synthetic_data.py
+#
+# Generate Boston-schema housing data of any size for benchmarks. Usage from
+# the project root:
+#     python -m src.synthetic_data --rows 1000000 --output data/synthetic_1m.csv
+
+import argparse
+import logging
+import os
+import numpy as np
+import pandas as pd
+from typing import Iterator, Optional, Sequence
+from src.data_loading import BOSTON_DTYPES
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# Missing values are only injected into float columns, so the CSV still parses
+# with BOSTON_DTYPES (chas, rad and tax are integers) and the target stays complete
+MISSING_COLUMNS = ('crim', 'zn', 'indus', 'nox', 'rm', 'age', 'dis', 'ptratio', 'b', 'lstat')
+
+# Decimal places written per column, as in the original CSV
+_DECIMALS = {
+    'crim': 5, 'zn': 1, 'indus': 2, 'nox': 3, 'rm': 3, 'age': 1, 'dis': 4,
+    'ptratio': 1, 'b': 2, 'lstat': 2, 'medv': 1
+}
+
+_ZN_VALUES = np.array([12.5, 18.0, 20.0, 21.0, 22.0, 25.0, 28.0, 30.0, 33.0, 34.0,
+                       35.0, 40.0, 45.0, 52.5, 55.0, 60.0, 70.0, 75.0, 80.0, 82.5, 85.0, 90.0, 95.0, 100.0])
+_RAD_VALUES = np.array([1, 2, 3, 4, 5, 6, 7, 8])
+_RAD_WEIGHTS = np.array([20, 24, 38, 110, 115, 26, 17, 24]) / 374
+
+def generate_boston_like(n_rows: int, missing_rate: float = 0.02,
+                         random_state: Optional[int] = 42) -> pd.DataFrame:
+    """
+    Generate a DataFrame with the columns and types of the Boston housing data.
+
+    Rows are driven by a latent "urbanity" score, so crime, industry, NOx, age,
+    lower-status share and distance to employment centres move together as in
+    the original data. `rad` 24 is the high-tax urban core. `chas` is a binary
+    category (about 7% ones). The target `medv` depends mainly on `rm` and
+    `lstat`, plus noise, and is capped at 50 like the original.
+
+    Parameters:
+    - n_rows: Number of rows.
+    - missing_rate: Fraction of values set to NaN in each column of MISSING_COLUMNS.
+    - random_state: Seed; None for a non-deterministic draw.
+
+    Returns:
+    - DataFrame with the columns of BOSTON_DTYPES.
+    """
+    rng = np.random.default_rng(random_state)
+    n = n_rows
+    urban = rng.beta(2.0, 2.0, n)
+
+    core = rng.random(n) < np.clip((urban - 0.55) * 3.0, 0.0, 1.0) * 0.9
+    rad = np.where(core, 24, rng.choice(_RAD_VALUES, size=n, p=_RAD_WEIGHTS))
+    tax = np.where(core, np.where(rng.random(n) < 0.95, 666, 711),
+                   np.clip(190 + 300 * urban + rng.normal(0, 40, n), 187, 711).round())
+    ptratio = np.where(core, 20.2, np.clip(rng.normal(17.5 + 2.0 * urban, 1.8, n), 12.6, 22.0))
+
+    crim = np.clip(np.exp(rng.normal(-2.5 + 4.0 * urban + 1.5 * core, 1.2, n)), 0.006, 89.0)
+    zoned = rng.random(n) < 0.6 * (1 - urban) ** 2
+    zn = np.where(zoned, rng.choice(_ZN_VALUES, size=n), 0.0)
+    indus = np.clip(1.5 + 20.0 * urban + rng.normal(0, 3.0, n), 0.46, 27.74)
+    nox = np.clip(0.40 + 0.35 * urban + rng.normal(0, 0.05, n), 0.385, 0.871)
+    rm = np.clip(rng.normal(6.3 - 0.8 * (urban - 0.5), 0.65, n), 3.56, 8.78)
+    age = np.clip(30.0 + 75.0 * urban + rng.normal(0, 15.0, n), 2.9, 100.0)
+    dis = np.clip(np.exp(rng.normal(1.9 - 1.2 * urban, 0.3, n)), 1.13, 12.13)
+    b = np.clip(396.9 - rng.exponential(20.0 + 60.0 * urban, n), 0.32, 396.9)
+    lstat = np.clip(3.0 + 20.0 * urban + rng.normal(0, 4.0, n) - 3.0 * (rm - 6.3), 1.73, 37.97)
+    chas = (rng.random(n) < 0.07).astype(np.int64)
+
+    medv = (33.0 - 0.75 * lstat + 4.5 * (rm - 6.3) + 3.0 * chas - 10.0 * (nox - 0.55)
+            - 0.6 * (dis - 3.8) - 0.05 * crim - 0.9 * (ptratio - 18.5) + rng.normal(0, 3.5, n))
+    medv = np.clip(medv, 5.0, 50.0)
+
+    df = pd.DataFrame({
+        'crim': crim, 'zn': zn, 'indus': indus, 'chas': chas, 'nox': nox, 'rm': rm,
+        'age': age, 'dis': dis, 'rad': rad, 'tax': tax, 'ptratio': ptratio, 'b': b,
+        'lstat': lstat, 'medv': medv
+    })
+    for column, decimals in _DECIMALS.items():
+        df[column] = df[column].round(decimals)
+    df = df.astype(BOSTON_DTYPES)
+
+    if missing_rate > 0:
+        for column in MISSING_COLUMNS:
+            df.loc[rng.random(n) < missing_rate, column] = np.nan
+    return df
+
+def iter_boston_like(n_rows: int, chunk_size: int = DEFAULT_CHUNK_SIZE, missing_rate: float = 0.02,
+                     random_state: Optional[int] = 42) -> Iterator[pd.DataFrame]:
+    """
+    Generate the same kind of data as generate_boston_like in chunks of at
+    most `chunk_size` rows, so datasets larger than memory can be produced.
+    Each chunk gets its own child seed, so the output is reproducible.
+    """
+    seeds = np.random.SeedSequence(random_state).spawn(-(-n_rows // chunk_size))
+    for i, seed in enumerate(seeds):
+        rows = min(chunk_size, n_rows - i * chunk_size)
+        yield generate_boston_like(rows, missing_rate, random_state=seed)
+
+def write_boston_like_csv(filepath: str, n_rows: int, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                          missing_rate: float = 0.02, random_state: Optional[int] = 42) -> str:
+    """
+    Write synthetic Boston-schema data to a CSV file chunk by chunk.
+
+    Parameters:
+    - filepath: Output CSV path.
+    - n_rows: Number of rows.
+    - chunk_size: Rows generated and written at a time; bounds memory.
+    - missing_rate: Fraction of NaNs per column of MISSING_COLUMNS.
+    - random_state: Seed.
+
+    Returns:
+    - filepath.
+    """
+    os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, 'w', newline='') as f:
+        for i, chunk in enumerate(iter_boston_like(n_rows, chunk_size, missing_rate, random_state)):
+            chunk.to_csv(f, index=False, header=(i == 0))
+    os.replace(tmp_path, filepath)
+    logging.info(f"Wrote {n_rows} synthetic rows to {filepath}")
+    return filepath
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Generate synthetic Boston-schema housing data.")
+    parser.add_argument('--rows', type=lambda value: int(float(value)), required=True,
+                        help="Number of rows, e.g. 1e6.")
+    parser.add_argument('--output', required=True, help="CSV file to write.")
+    parser.add_argument('--missing-rate', type=float, default=0.02)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s:%(message)s')
+    write_boston_like_csv(args.output, args.rows, args.chunk_size, args.missing_rate, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+# src/training_farm.py
+#
+# Train one model per market segment. The loaded frame is partitioned by key
+# columns and every segment is preprocessed, trained, tuned and evaluated in
+# its own worker process, with one model artifact per segment. Usage from the
+# project root:
+#     python -m src.training_farm --keys rad --workers 4
+#     python -m src.training_farm --data data/synthetic_1m.csv --keys rad chas --output models/segments
+
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context, shared_memory
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from src.data_loading import load_data, BOSTON_DTYPES
+from src.data_preprocessing import preprocess_data
+from src.hyperparameter_tuning import hyperparameter_tuning
+from src.model_evaluation import evaluate_model
+from src.model_training import train_models
+from src.utils import MODEL_FORMATS, save_model
+
+DEFAULT_PARAM_GRID = {
+    'regressor__max_depth': [None, 5, 10],
+    'regressor__min_samples_leaf': [1, 2, 4]
+}
+DEFAULT_MIN_ROWS = 50  # Smaller segments are skipped: too few rows for a test split and 5 CV folds
+
+class SharedFrameSpec(NamedTuple):
+    """
+    Location of a numeric DataFrame in a shared memory block: the block name,
+    the number of rows and (column, dtype, byte offset) per column.
+    """
+    name: str
+    n_rows: int
+    columns: List[Tuple[str, str, int]]
+
+class Segment(NamedTuple):
+    """
+    Rows [start, stop) of the key-sorted shared frame with one combination of key values.
+    """
+    name: str
+    keys: Dict[str, object]
+    start: int
+    stop: int
+
+def share_frame(df: pd.DataFrame) -> Tuple[shared_memory.SharedMemory, SharedFrameSpec]:
+    """
+    Copy the columns of a numeric DataFrame into one shared memory block.
+
+    Workers attach to the block with attach_frame and read the data in place,
+    so the frame exists once in memory however many workers run. The caller
+    must close and unlink the block when the workers are done.
+
+    Parameters:
+    - df: DataFrame with numeric columns only.
+
+    Returns:
+    - The shared memory block and the spec needed to attach to it.
+    """
+    non_numeric = [name for name, dtype in df.dtypes.items() if not pd.api.types.is_numeric_dtype(dtype)
+                   or isinstance(dtype, pd.CategoricalDtype)]
+    if non_numeric:
+        raise ValueError(f"Only numeric columns can be shared, got non-numeric columns {non_numeric}")
+
+    columns, size = [], 0
+    for name, dtype in df.dtypes.items():
+        columns.append((name, np.dtype(dtype).str, size))
+        size += len(df) * np.dtype(dtype).itemsize
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for name, dtype, offset in columns:
+        target = np.ndarray(len(df), dtype=dtype, buffer=block.buf, offset=offset)
+        target[:] = df[name].to_numpy()
+    return block, SharedFrameSpec(block.name, len(df), columns)
+
+def attach_frame(spec: SharedFrameSpec) -> Tuple[shared_memory.SharedMemory, pd.DataFrame]:
+    """
+    Build a read-only DataFrame over a block created by share_frame, without copying.
+
+    The frame must be released before the block is closed.
+    """
+    block = shared_memory.SharedMemory(name=spec.name)
+    data = {}
+    for name, dtype, offset in spec.columns:
+        column = np.ndarray(spec.n_rows, dtype=dtype, buffer=block.buf, offset=offset)
+        column.flags.writeable = False
+        data[name] = column
+    return block, pd.DataFrame(data, copy=False)
+
+def partition_frame(df: pd.DataFrame, keys: Sequence[str]) -> Tuple[pd.DataFrame, List[Segment]]:
+    """
+    Sort the frame by the key columns so every segment is a contiguous block of rows.
+
+    Parameters:
+    - df: Loaded data.
+    - keys: Columns whose value combinations define the segments.
+
+    Returns:
+    - The sorted frame (rows with a missing key are dropped) and its segments.
+    """
+    keys = list(keys)
+    missing = [key for key in keys if key not in df.columns]
+    if missing:
+        raise ValueError(f"Key columns {missing} are not in the data")
+
+    complete = df.dropna(subset=keys)
+    if len(complete) < len(df):
+        logging.info(f"Dropped {len(df) - len(complete)} rows with a missing key")
+    sorted_df = complete.sort_values(keys, kind='stable').reset_index(drop=True)
+
+    segments, start = [], 0
+    for values, size in sorted_df.groupby(keys, sort=True, observed=True).size().items():
+        values = values if isinstance(values, tuple) else (values,)
+        segment_keys = {key: value.item() if hasattr(value, 'item') else value
+                        for key, value in zip(keys, values)}
+        name = '_'.join(f"{key}-{value}" for key, value in segment_keys.items())
+        segments.append(Segment(name, segment_keys, start, start + size))
+        start += size
+    return sorted_df, segments
+
+def _init_worker(log_level: int):
+    logging.basicConfig(level=log_level, format='%(asctime)s:%(levelname)s:%(processName)s:%(message)s')
+
+def _fit_segment(df: pd.DataFrame, segment: Segment, output_dir: str, param_grid: dict,
+                 test_size: float, random_state: int, model_format: str) -> dict:
+    X, y, preprocessor = preprocess_data(df)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=random_state)
+    # The pool already runs one segment per core
+    models = train_models(X_train, y_train, preprocessor, n_jobs=1)
+    metrics = {name: evaluate_model(model, X_test, y_test) for name, model in models.items()}
+    best_dt = hyperparameter_tuning(models['Decision Tree'], X_train, y_train, param_grid,
+                                    cache_preprocessing=True, n_jobs=1)
+    metrics['Tuned Decision Tree'] = evaluate_model(best_dt, X_test, y_test)
+
+    model_path = os.path.join(output_dir, f"{segment.name}.joblib")
+    save_model(best_dt, model_path, model_format=model_format)
+    return {'segment': segment.name, 'keys': segment.keys, 'rows': segment.stop - segment.start,
+            'model_path': model_path, 'metrics': metrics}
+
+def train_segment(spec: SharedFrameSpec, segment: Segment, output_dir: str, param_grid: dict,
+                  test_size: float = 0.2, random_state: int = 42, model_format: str = 'joblib') -> dict:
+    """
+    Preprocess, train, evaluate and tune the models of one segment and save the tuned model.
+
+    Runs in a worker process; the segment's rows are read from the shared frame.
+
+    Returns:
+    - Report with the segment's keys, row count, model path and test metrics per model.
+    """
+    block, frame = attach_frame(spec)
+    try:
+        return _fit_segment(frame.iloc[segment.start:segment.stop], segment, output_dir, param_grid,
+                            test_size, random_state, model_format)
+    finally:
+        del frame  # Views into the block must be gone before it is closed
+        block.close()
+
+def train_farm(df: pd.DataFrame, keys: Sequence[str], output_dir: str,
+               max_workers: Optional[int] = None,
+               param_grid: Optional[dict] = None,
+               min_rows: int = DEFAULT_MIN_ROWS,
+               test_size: float = 0.2,
+               random_state: int = 42,
+               model_format: str = 'joblib') -> List[dict]:
+    """
+    Train one tuned model per segment in a pool of worker processes.
+
+    The frame is sorted by the keys and copied once into shared memory; each
+    worker reads its segment from there instead of receiving a pickled copy.
+    At most max_workers segments are processed at a time.
+
+    Parameters:
+    - df: Loaded data (numeric columns, as returned by load_data without compact).
+    - keys: Columns that define the segments, e.g. ['rad'] or ['rad', 'chas'].
+    - output_dir: Directory for the per-segment models and farm_report.json.
+    - max_workers: Maximum number of concurrent segments (default: number of CPUs).
+    - param_grid: Decision Tree grid tuned per segment (default: DEFAULT_PARAM_GRID).
+    - min_rows: Segments with fewer rows are skipped.
+    - test_size: Fraction of each segment held out for evaluation.
+    - random_state: Seed for the train/test split.
+    - model_format: Artifact format, one of MODEL_FORMATS.
+
+    Returns:
+    - One report per segment, also written to output_dir/farm_report.json. Skipped
+      and failed segments have an 'error' entry instead of metrics.
+    """
+    if model_format not in MODEL_FORMATS:
+        raise ValueError(f"model_format must be one of {MODEL_FORMATS}, got '{model_format}'")
+    param_grid = DEFAULT_PARAM_GRID if param_grid is None else param_grid
+    os.makedirs(output_dir, exist_ok=True)
+
+    sorted_df, segments = partition_frame(df, keys)
+    reports = [{'segment': s.name, 'keys': s.keys, 'rows': s.stop - s.start,
+                'error': f"fewer than {min_rows} rows"} for s in segments if s.stop - s.start < min_rows]
+    segments = [s for s in segments if s.stop - s.start >= min_rows]
+    logging.info(f"Training {len(segments)} segments by {list(keys)}, skipping {len(reports)} small ones")
+
+    block, spec = share_frame(sorted_df)
+    del sorted_df
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context('spawn'),
+                                 initializer=_init_worker,
+                                 initargs=(logging.getLogger().getEffectiveLevel(),)) as pool:
+            futures = {pool.submit(train_segment, spec, segment, output_dir, param_grid,
+                                   test_size, random_state, model_format): segment
+                       for segment in segments}
+            for future in as_completed(futures):
+                segment = futures[future]
+                try:
+                    report = future.result()
+                    r2 = report['metrics']['Tuned Decision Tree']['R2_Score']
+                    logging.info(f"Segment {segment.name}: {report['rows']} rows, tuned R2 {r2:.4f}")
+                except Exception as e:
+                    logging.error(f"Segment {segment.name} failed: {e}")
+                    report = {'segment': segment.name, 'keys': segment.keys,
+                              'rows': segment.stop - segment.start, 'error': str(e)}
+                reports.append(report)
+    finally:
+        block.close()
+        block.unlink()
+
+    reports.sort(key=lambda report: report['segment'])
+    with open(os.path.join(output_dir, 'farm_report.json'), 'w') as f:
+        json.dump(reports, f, indent=2)
+    logging.info(f"Farm report saved to {os.path.join(output_dir, 'farm_report.json')}")
+    return reports
+
+def main():
+    parser = argparse.ArgumentParser(description="Train one tuned model per data segment.")
+    parser.add_argument('--data', default=os.path.join('data', 'boston_housing.csv'))
+    parser.add_argument('--keys', nargs='+', default=['rad'], help="Columns that define the segments.")
+    parser.add_argument('--output', default=os.path.join('models', 'segments'))
+    parser.add_argument('--workers', type=int, default=None, help="Concurrent segments (default: CPU count).")
+    parser.add_argument('--min-rows', type=int, default=DEFAULT_MIN_ROWS)
+    parser.add_argument('--model-format', choices=MODEL_FORMATS, default='joblib')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s:%(levelname)s:%(message)s')
+    df = load_data(args.data, dtype=BOSTON_DTYPES)
+    reports = train_farm(df, args.keys, args.output, max_workers=args.workers,
+                         min_rows=args.min_rows, model_format=args.model_format)
+    failed = [report['segment'] for report in reports if 'error' in report]
+    logging.info(f"Trained {len(reports) - len(failed)} of {len(reports)} segments")
+
+if __name__ == "__main__":
+    main()
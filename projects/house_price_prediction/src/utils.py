@@ -1,29 +1,148 @@
 # src/utils.py
 
-import joblib
+import os
+import threading
 import logging
+from collections import OrderedDict
+from typing import Dict, Optional
+from src.profiling import profile_stage
 
-def save_model(model, filename: str) -> None:
+DEFAULT_MODEL_CACHE_SIZE = 4  # Maximum number of models kept in memory
+
+# 'joblib': uncompressed pickle, loadable with mmap_mode
+# 'lz4': lz4-compressed pickle, smaller on disk (requires the lz4 package)
+# 'compiled': CompiledModel arrays (.npz); loads without sklearn or pandas
+MODEL_FORMATS = ('joblib', 'lz4', 'compiled')
+
+_ZIP_MAGIC = b'PK\x03\x04'  # np.savez archives, i.e. compiled models
+
+_model_cache: "OrderedDict[tuple, object]" = OrderedDict()
+_model_cache_lock = threading.Lock()
+_model_cache_size = DEFAULT_MODEL_CACHE_SIZE
+_model_cache_stats = {'hits': 0, 'misses': 0}
+
+@profile_stage('save')
+def save_model(model, filename: str, model_format: str = 'joblib') -> None:
     """
     Save the trained model to a file.
 
     Parameters:
     - model: Trained model.
     - filename: Name of the file to save the model.
+    - model_format: One of MODEL_FORMATS. 'compiled' requires a pipeline
+      supported by compile_pipeline. load_model detects the format itself.
     """
-    joblib.dump(model, filename)
-    logging.info(f"Model saved to {filename}")
+    if model_format not in MODEL_FORMATS:
+        raise ValueError(f"model_format must be one of {MODEL_FORMATS}, got '{model_format}'")
+    if model_format == 'compiled':
+        from src.compiled_model import compile_pipeline
+        compile_pipeline(model).save(filename)
+    else:
+        if model_format == 'lz4':
+            try:
+                import lz4  # noqa: F401  Optional dependency, only needed for this format
+            except ImportError as e:
+                raise ImportError("model_format 'lz4' requires lz4: pip install lz4") from e
+        import joblib
+        joblib.dump(model, filename, compress='lz4' if model_format == 'lz4' else 0)
+    logging.info(f"Model saved to {filename} ({model_format})")
+
+def _load_artifact(filename: str, mmap_mode: Optional[str]):
+    with open(filename, 'rb') as f:
+        compiled = f.read(len(_ZIP_MAGIC)) == _ZIP_MAGIC
+    if compiled:
+        from src.compiled_model import CompiledModel
+        return CompiledModel.load(filename)
+    # Imported here so loading a compiled model does not import joblib
+    import joblib
+    return joblib.load(filename, mmap_mode=mmap_mode)
 
-def load_model(filename: str):
+def load_model(filename: str, mmap_mode: Optional[str] = None, use_cache: bool = True):
     """
     Load a trained model from a file.
 
+    Models are kept in a process-wide LRU cache keyed on the file's path,
+    modification time and size, so a model is only deserialized again after
+    the file changes. Cached models are shared between callers and must be
+    treated as read-only.
+
     Parameters:
     - filename: Name of the file from which to load the model.
+    - mmap_mode: Optional joblib memory-map mode (e.g. 'r'). Numpy arrays inside
+      the model are then mapped from the file instead of copied, so worker
+      processes share them through the OS page cache. Requires the default
+      uncompressed 'joblib' format; ignored for the other formats.
+    - use_cache: Set to False to bypass the cache entirely.
 
     Returns:
-    - Loaded model.
+    - Loaded model: the pickled object, or a CompiledModel for the 'compiled' format.
     """
-    model = joblib.load(filename)
+    if not use_cache:
+        model = _load_artifact(filename, mmap_mode)
+        logging.info(f"Model loaded from {filename}")
+        return model
+
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size, mmap_mode)
+
+    with _model_cache_lock:
+        if key in _model_cache:
+            _model_cache.move_to_end(key)
+            _model_cache_stats['hits'] += 1
+            return _model_cache[key]
+        _model_cache_stats['misses'] += 1
+
+    model = _load_artifact(filename, mmap_mode)
     logging.info(f"Model loaded from {filename}")
+
+    with _model_cache_lock:
+        # Drop entries for older versions of the same file
+        for stale_key in [k for k in _model_cache if k[0] == path and k[1:3] != key[1:3]]:
+            del _model_cache[stale_key]
+        _model_cache[key] = model
+        _model_cache.move_to_end(key)
+        while len(_model_cache) > _model_cache_size:
+            _model_cache.popitem(last=False)
+
     return model
+
+def set_model_cache_size(max_models: int) -> None:
+    """
+    Set the maximum number of models kept by load_model, evicting the least
+    recently used ones if needed.
+
+    Parameters:
+    - max_models: New cache size. 0 disables caching.
+    """
+    global _model_cache_size
+    if max_models < 0:
+        raise ValueError(f"max_models must be non-negative, got {max_models}")
+    with _model_cache_lock:
+        _model_cache_size = max_models
+        while len(_model_cache) > _model_cache_size:
+            _model_cache.popitem(last=False)
+
+def clear_model_cache() -> None:
+    """
+    Remove all cached models and reset the hit/miss counters.
+    """
+    with _model_cache_lock:
+        _model_cache.clear()
+        _model_cache_stats['hits'] = 0
+        _model_cache_stats['misses'] = 0
+
+def model_cache_info() -> Dict[str, int]:
+    """
+    Report the state of the model cache.
+
+    Returns:
+    - Dictionary with hit and miss counts, current size and maximum size.
+    """
+    with _model_cache_lock:
+        return {
+            'hits': _model_cache_stats['hits'],
+            'misses': _model_cache_stats['misses'],
+            'size': len(_model_cache),
+            'max_size': _model_cache_size
+        }
@@ -0,0 +1,79 @@
+# benchmarks/bench_read.py
+#
+# Read time, frame memory and peak RSS of the previous imports-85 loading code
+# (read_csv, then per-column to_numeric and astype) against the schema-driven
+# reader with the C and pyarrow engines, whole and in chunks. The input is
+# imports-85.data repeated to the requested size; each mode runs in a fresh
+# process. Run from the project directory:
+#     python -m benchmarks.bench_read --rows 2000000
+
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+MODES = ('legacy', 'c', 'pyarrow', 'c chunked', 'pyarrow chunked')
+
+def _legacy_read(filepath):
+    import pandas as pd
+    from vehicle_data import CATEGORICAL_COLUMNS, COLUMN_NAMES, NUMERIC_COLUMNS
+    df = pd.read_csv(filepath, names=COLUMN_NAMES, na_values='?', sep=',', skipinitialspace=True)
+    for column in NUMERIC_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors='coerce')
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].astype('category')
+    return df
+
+def _run(mode: str, filepath: str, chunksize: int) -> dict:
+    from vehicle_data import iter_imports85, read_imports85
+    start = time.perf_counter()
+    if mode == 'legacy':
+        frame_bytes = _legacy_read(filepath).memory_usage(deep=True).sum()
+    elif mode.endswith('chunked'):
+        # Only one chunk is alive at a time; frame MB is that of the largest
+        frame_bytes = 0
+        for chunk in iter_imports85(filepath, chunksize=chunksize, engine=mode.split()[0]):
+            frame_bytes = max(frame_bytes, chunk.memory_usage(deep=True).sum())
+    else:
+        frame_bytes = read_imports85(filepath, engine=mode).memory_usage(deep=True).sum()
+    return {
+        'seconds': time.perf_counter() - start,
+        'frame_mb': frame_bytes / 2**20,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KiB on Linux
+    }
+
+def run_in_fresh_process(*args) -> dict:
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(_run, args)
+
+def main():
+    parser = argparse.ArgumentParser(description="Legacy vs. schema-driven imports-85 reading.")
+    parser.add_argument('--data', default='imports-85.data')
+    parser.add_argument('--rows', type=lambda value: int(float(value)), default=2_000_000)
+    parser.add_argument('--chunksize', type=int, default=250_000)
+    parser.add_argument('--modes', default=','.join(MODES))
+    args = parser.parse_args()
+
+    with open(args.data, 'rb') as f:
+        lines = f.read().splitlines(keepends=True)
+    workdir = tempfile.mkdtemp(prefix='bench_read_')
+    try:
+        filepath = os.path.join(workdir, 'dump.data')
+        with open(filepath, 'wb') as f:
+            for start in range(0, args.rows, len(lines)):
+                f.writelines(lines[:args.rows - start])
+        size_mb = os.path.getsize(filepath) / 2**20
+
+        print(f"{args.rows} rows, {size_mb:.0f} MB file, chunks of {args.chunksize}")
+        print(f"{'mode':<18}{'seconds':>9}{'frame MB':>10}{'peak RSS MB':>13}")
+        for mode in args.modes.split(','):
+            stats = run_in_fresh_process(mode, filepath, args.chunksize)
+            print(f"{mode:<18}{stats['seconds']:>9.2f}{stats['frame_mb']:>10.1f}{stats['peak_rss_mb']:>13.0f}")
+    finally:
+        shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# benchmarks/bench_sparse.py
+#
+# Dense vs. CSR feature matrices for the vehicle price model at catalogue
+# sizes with many makes. Rows are resampled from imports-85.data and given
+# synthetic makes (Zipf-distributed, each with its own price effect). Reports
+# matrix memory, encode and fit time, peak traced memory and hold-out R2.
+# Sparse predictions come from an iterative solver; the run fails (exit code
+# 1) if any differs from the dense one by more than --max-diff dollars.
+# Run from the project directory:
+#     python -m benchmarks.bench_sparse --rows 20000 --makes 100,1000,2500
+
+import argparse
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import MaxAbsScaler
+from vehicle_data import CATEGORICAL_COLUMNS, COLUMN_NAMES, NUMERIC_COLUMNS
+from vehicle_preprocessing import (ONE_HOT_COLUMNS, SPARSE_TOL, TARGET_COLUMN, VehiclePreprocessor,
+                                   imputation_statistics)
+
+def make_catalogue(source: pd.DataFrame, n_rows: int, n_makes: int, random_state: int = 42) -> pd.DataFrame:
+    """
+    Resample the source rows and replace their make with one of n_makes synthetic makes.
+    """
+    rng = np.random.default_rng(random_state)
+    df = source.iloc[rng.integers(0, len(source), n_rows)].reset_index(drop=True)
+    weights = 1 / np.arange(1, n_makes + 1)
+    makes = rng.choice(n_makes, size=n_rows, p=weights / weights.sum())
+    df['make'] = pd.Series(makes).map(lambda make: f"make-{make:05d}")
+    df[TARGET_COLUMN] = df[TARGET_COLUMN] + rng.normal(0, 3000, n_makes)[makes]
+    return df
+
+def matrix_mb(matrix) -> float:
+    if sp.issparse(matrix):
+        return (matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 2**20
+    return matrix.to_numpy().nbytes / 2**20
+
+def _encode_and_fit(df: pd.DataFrame, sparse_output: bool) -> dict:
+    start = time.perf_counter()
+    fill_values = imputation_statistics(df, NUMERIC_COLUMNS, CATEGORICAL_COLUMNS)
+    df = df.fillna(fill_values)  # As in training, the encoders are fitted on imputed data
+    preprocessor = VehiclePreprocessor(fill_values, sparse_output=sparse_output).fit(df)
+    features = preprocessor.transform(df)
+    encode_seconds = time.perf_counter() - start
+
+    X_train, X_test, y_train, y_test = train_test_split(features, df[TARGET_COLUMN], test_size=0.2, random_state=42)
+    model = (make_pipeline(MaxAbsScaler(), LinearRegression(tol=SPARSE_TOL)) if sparse_output
+             else LinearRegression())
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    predictions = model.predict(X_test)
+    return {
+        'features': features.shape[1],
+        'matrix_mb': matrix_mb(features),
+        'encode_seconds': encode_seconds,
+        'fit_seconds': fit_seconds,
+        'r2': r2_score(y_test, predictions),
+        'predictions': predictions
+    }
+
+def run(df: pd.DataFrame, sparse_output: bool) -> dict:
+    """
+    Time one untraced run, then repeat it under tracemalloc for the peak
+    memory (tracing slows pandas down too much to time the same run).
+    """
+    stats = _encode_and_fit(df, sparse_output)
+    tracemalloc.start()
+    _encode_and_fit(df, sparse_output)
+    stats['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory and fit time of dense vs. sparse vehicle features.")
+    parser.add_argument('--data', default='imports-85.data')
+    parser.add_argument('--rows', type=lambda value: int(float(value)), default=20_000)
+    parser.add_argument('--makes', default='100,1000,2500', help="Comma-separated numbers of distinct makes.")
+    parser.add_argument('--max-dense-mb', type=float, default=1000,
+                        help="Skip the dense run when its matrix would be larger than this.")
+    parser.add_argument('--max-diff', type=float, default=0.01,
+                        help="Largest allowed difference between a sparse and a dense prediction, in dollars.")
+    args = parser.parse_args()
+
+    source = pd.read_csv(args.data, names=COLUMN_NAMES, na_values='?', skipinitialspace=True)
+    source = source.dropna(subset=[TARGET_COLUMN])
+
+    failures = []
+    print(f"Sparse fits use lsqr with tol={SPARSE_TOL:g}; sparse and dense predictions may differ by "
+          f"at most {args.max_diff:g}")
+    print(f"{'makes':>6}{'mode':>8}{'features':>10}{'matrix MB':>11}{'encode s':>10}{'fit s':>9}"
+          f"{'peak MB':>10}{'R2':>9}{'max |diff|':>12}")
+    for n_makes in (int(value) for value in args.makes.split(',')):
+        df = make_catalogue(source, args.rows, n_makes)
+        results = {}
+        for mode in ('dense', 'sparse'):
+            n_features = len(COLUMN_NAMES) + df[ONE_HOT_COLUMNS].nunique().sum()
+            if mode == 'dense' and args.rows * n_features * 8 / 2**20 > args.max_dense_mb:
+                print(f"{n_makes:>6}{mode:>8}  skipped: dense matrix above --max-dense-mb")
+                continue
+            results[mode] = stats = run(df, sparse_output=mode == 'sparse')
+            diff = (np.abs(stats['predictions'] - results['dense']['predictions']).max()
+                    if 'dense' in results else float('nan'))
+            print(f"{n_makes:>6}{mode:>8}{stats['features']:>10}{stats['matrix_mb']:>11.1f}"
+                  f"{stats['encode_seconds']:>10.3f}{stats['fit_seconds']:>9.2f}{stats['peak_mb']:>10.1f}"
+                  f"{stats['r2']:>9.4f}{diff:>12.2e}")
+            if diff > args.max_diff:
+                failures.append(f"{n_makes} makes: sparse predictions differ by up to {diff:.4g}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
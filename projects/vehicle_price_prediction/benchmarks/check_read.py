@@ -0,0 +1,95 @@
+# benchmarks/check_read.py
+#
+# Parity check for vehicle_data: the C and pyarrow engines must return
+# identical frames, whole and in chunks, for imports-85.data and for variants
+# with whitespace after the commas and with values outside the category
+# vocabulary. Fails with exit code 1 otherwise. Run from the project directory:
+#     python -m benchmarks.check_read
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import warnings
+import pandas as pd
+from vehicle_data import iter_imports85, read_imports85
+
+def padded(line: str) -> str:
+    # One or two spaces after every comma, including before '?'
+    fields = line.split(',')
+    return ','.join([fields[0]] + [' ' * (1 + i % 2) + field for i, field in enumerate(fields[1:])])
+
+def with_unknown_makes(line: str, row: int) -> str:
+    fields = line.split(',')
+    if row % 10 == 0:
+        fields[2] = 'tesla'
+    return ','.join(fields)
+
+VARIANTS = {
+    'original': lambda line, row: line,
+    'padded': lambda line, row: padded(line),
+    'unknown makes': with_unknown_makes,
+    'padded unknown makes': lambda line, row: padded(with_unknown_makes(line, row)),
+}
+
+def read(filepath: str, engine: str, chunksize: int = None):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        if chunksize is None:
+            df = read_imports85(filepath, engine=engine)
+            return df, df.attrs['unknown_categories']
+        chunks = list(iter_imports85(filepath, chunksize=chunksize, engine=engine))
+    unknown = {}
+    for chunk in chunks:
+        for column, counts in chunk.attrs['unknown_categories'].items():
+            for value, count in counts.items():
+                unknown.setdefault(column, {})[value] = unknown.get(column, {}).get(value, 0) + count
+    return pd.concat(chunks, ignore_index=True), unknown
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if the C and pyarrow readers disagree.")
+    parser.add_argument('--data', default='imports-85.data')
+    parser.add_argument('--chunksize', type=int, default=37)
+    args = parser.parse_args()
+
+    with open(args.data) as f:
+        lines = f.read().splitlines()
+    workdir = tempfile.mkdtemp(prefix='check_read_')
+    failures = []
+    try:
+        print(f"{'variant':<22}{'mode':<10}{'rows':>6}{'missing':>9}  unknown categories")
+        for name, transform in VARIANTS.items():
+            filepath = os.path.join(workdir, f"{name.replace(' ', '_')}.data")
+            with open(filepath, 'w') as f:
+                f.write('\n'.join(transform(line, row) for row, line in enumerate(lines)) + '\n')
+            for mode, chunksize in (('whole', None), ('chunked', args.chunksize)):
+                c_df, c_unknown = read(filepath, 'c', chunksize)
+                arrow_df, arrow_unknown = read(filepath, 'pyarrow', chunksize)
+                print(f"{name:<22}{mode:<10}{len(c_df):>6}{int(c_df.isna().sum().sum()):>9}  {c_unknown or '-'}")
+                try:
+                    pd.testing.assert_frame_equal(c_df, arrow_df)
+                except AssertionError as e:
+                    failures.append(f"{name}, {mode}: engines differ: {e}")
+                if c_unknown != arrow_unknown:
+                    failures.append(f"{name}, {mode}: unknown categories differ: {c_unknown} vs {arrow_unknown}")
+            # Whitespace must not change what is read
+            if name.startswith('padded'):
+                unpadded = os.path.join(workdir, f"{name[len('padded '):].replace(' ', '_') or 'original'}.data")
+                try:
+                    pd.testing.assert_frame_equal(read(filepath, 'pyarrow')[0], read(unpadded, 'pyarrow')[0])
+                except AssertionError as e:
+                    failures.append(f"{name}: differs from the unpadded file: {e}")
+            if 'unknown' in name and c_unknown.get('make', {}).get('tesla', 0) != -(-len(lines) // 10):
+                failures.append(f"{name}: expected {-(-len(lines) // 10)} unknown makes, got {c_unknown}")
+            if name == 'original' and c_unknown:
+                failures.append(f"{name}: unexpected unknown categories {c_unknown}")
+    finally:
+        shutil.rmtree(workdir)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,9 @@ import os
 # Define the directory where models and encoders are saved
 model_dir = 'models'
 
-# Paths to the saved model and encoders
+# Paths to the saved model and preprocessing artifact
 model_path = os.path.join(model_dir, 'vehicle_price_model.joblib')
-encoder_fuel_type_path = os.path.join(model_dir, 'label_encoder_fuel-type.joblib')
-encoder_aspiration_path = os.path.join(model_dir, 'label_encoder_aspiration.joblib')
-encoder_engine_location_path = os.path.join(model_dir, 'label_encoder_engine-location.joblib')
-encoder_num_of_doors_path = os.path.join(model_dir, 'label_encoder_num-of-doors.joblib')
+preprocessor_path = os.path.join(model_dir, 'vehicle_preprocessor.joblib')
 
 # Load the trained model
 try:
@@ -21,13 +18,10 @@ except FileNotFoundError:
     print(f"Error: The model file '{model_path}' was not found.")
     exit()
 
-# Load the LabelEncoders
+# Load the preprocessing artifact (encoders, one-hot vocabulary and imputation values)
 try:
-    encoder_fuel_type = joblib.load(encoder_fuel_type_path)
-    encoder_aspiration = joblib.load(encoder_aspiration_path)
-    encoder_engine_location = joblib.load(encoder_engine_location_path)
-    encoder_num_of_doors = joblib.load(encoder_num_of_doors_path)
-    print("Loaded all LabelEncoders.")
+    preprocessor = joblib.load(preprocessor_path)
+    print(f"Loaded preprocessing artifact from '{preprocessor_path}'.")
 except FileNotFoundError as e:
     print(f"Error: {e}")
     exit()
@@ -36,94 +30,31 @@ except FileNotFoundError as e:
 def preprocess_new_data(input_data):
     """
     Preprocesses the input data to match the training data's format.
-    
+
+    Missing values are filled with the values used during training, binary
+    columns are label encoded and multi-class columns one-hot encoded, for
+    the whole batch at once.
+
     Parameters:
-    - input_data (dict): A dictionary containing feature names and their corresponding values.
-    
+    - input_data (dict, list of dicts or pd.DataFrame): One or more vehicles.
+
     Returns:
-    - pd.DataFrame: A preprocessed DataFrame ready for prediction.
+    - pd.DataFrame: A preprocessed DataFrame ready for prediction, one row per vehicle.
     """
-    # Convert input data to DataFrame
-    df_new = pd.DataFrame([input_data])
-    
-    # Define numerical and categorical columns as per training
-    numeric_columns = [
-        'symboling', 'normalized-losses', 'wheel-base', 'length', 'width',
-        'height', 'curb-weight', 'engine-size', 'bore', 'stroke',
-        'compression-ratio', 'horsepower', 'peak-rpm', 'city-mpg',
-        'highway-mpg'
-    ]
-    
-    categorical_columns = [
-        'make', 'fuel-type', 'aspiration', 'body-style',
-        'drive-wheels', 'engine-type',
-        'num-of-cylinders', 'fuel-system'
-    ]
-    
-    # Handle missing values if any (you can define specific strategies)
-    # For simplicity, we'll fill numerical NaNs with mean and categorical NaNs with mode
-    for column in numeric_columns:
-        if column in df_new.columns:
-            df_new[column] = pd.to_numeric(df_new[column], errors='coerce')
-            if df_new[column].isnull().sum() > 0:
-                # Set to mean value used during training
-                if column == 'normalized-losses':
-                    df_new[column].fillna(122.00, inplace=True)
-                elif column == 'bore':
-                    df_new[column].fillna(3.33, inplace=True)
-                elif column == 'stroke':
-                    df_new[column].fillna(3.26, inplace=True)
-                elif column == 'horsepower':
-                    df_new[column].fillna(104.26, inplace=True)
-                elif column == 'peak-rpm':
-                    df_new[column].fillna(5125.37, inplace=True)
-                else:
-                    # For other numerical columns, set to mean or a default value
-                    df_new[column].fillna(df_new[column].mean(), inplace=True)
-    
-    for column in categorical_columns:
-        if column in df_new.columns:
-            df_new[column] = df_new[column].astype('category')
-            if df_new[column].isnull().sum() > 0:
-                # Set to mode or a default category
-                if column == 'num-of-doors':
-                    df_new[column].fillna('four', inplace=True)
-                else:
-                    df_new[column].fillna(df_new[column].mode()[0], inplace=True)
-    
-    # Encode binary categorical variables using the loaded LabelEncoders
-    try:
-        df_new['fuel-type'] = encoder_fuel_type.transform(df_new['fuel-type'])
-        df_new['aspiration'] = encoder_aspiration.transform(df_new['aspiration'])
-        df_new['engine-location'] = encoder_engine_location.transform(df_new['engine-location'])
-        df_new['num-of-doors'] = encoder_num_of_doors.transform(df_new['num-of-doors'])
-        print("Encoded binary categorical variables.")
-    except ValueError as ve:
-        print(f"Encoding error: {ve}")
-        exit()
-    
-    # One-Hot Encoding for multi-class categorical variables
-    df_new = pd.get_dummies(
-        df_new,
-        columns=['make', 'body-style', 'drive-wheels', 
-                 'engine-type', 'num-of-cylinders', 'fuel-system'],
-        drop_first=True
-    )
-    print("Applied One-Hot Encoding to multi-class categorical variables.")
-    
-    # Ensure that the new data has the same dummy variables as the training data
-    # Load training feature columns from the model
-    training_features = model.feature_names_in_
-    
-    # Add missing columns with zeros
-    for col in training_features:
-        if col not in df_new.columns:
-            df_new[col] = 0
-    
-    # Ensure the order of columns matches the training data
-    df_new = df_new[training_features]
-    
-    return df_new
+    return preprocessor.transform(input_data)
+
+# Function to score a batch of vehicles
+def predict_prices(vehicles):
+    """
+    Predicts the price of every vehicle in a batch with one model call.
+
+    Parameters:
+    - vehicles (list of dicts or pd.DataFrame): Vehicles to score, e.g. a listing feed.
+
+    Returns:
+    - np.ndarray: Predicted prices, in input order.
+    """
+    return model.predict(preprocess_new_data(vehicles))
 
 # Example: Define new input data
 new_vehicle = {
@@ -162,3 +93,8 @@ print(preprocessed_data)
 # Make prediction
 predicted_price = model.predict(preprocessed_data)
 print(f"\nPredicted Vehicle Price: ${predicted_price[0]:.2f}")
+
+# Score a batch of vehicles in one step, e.g. a listing feed
+listing_feed = [new_vehicle, {**new_vehicle, 'make': 'bmw', 'horsepower': None, 'num-of-doors': 'two'}]
+batch_prices = predict_prices(listing_feed)
+print(f"\nPredicted Prices for {len(batch_prices)} Listings: {np.round(batch_prices, 2)}")
@@ -0,0 +1,244 @@
+# vehicle_data.py
+#
+# Schema-driven reader for files in the imports-85 format (the UCI Automobile
+# data). Columns are parsed straight into their final dtypes in one pass:
+# float32 numbers and categoricals with a fixed vocabulary, using pandas' C
+# parser or pyarrow. Multi-GB dumps can be read in chunks.
+
+import warnings
+import numpy as np
+import pandas as pd
+
+# Columns of imports-85.data, as per the dataset documentation
+COLUMN_NAMES = [
+    'symboling', 'normalized-losses', 'make', 'fuel-type', 'aspiration',
+    'num-of-doors', 'body-style', 'drive-wheels', 'engine-location',
+    'wheel-base', 'length', 'width', 'height', 'curb-weight',
+    'engine-type', 'num-of-cylinders', 'engine-size', 'fuel-system',
+    'bore', 'stroke', 'compression-ratio', 'horsepower', 'peak-rpm',
+    'city-mpg', 'highway-mpg', 'price'
+]
+
+# Vocabulary of every categorical column, as documented for the dataset. Sorted,
+# so category codes and one-hot columns come out in alphabetical order.
+CATEGORIES = {
+    'make': ['alfa-romero', 'audi', 'bmw', 'chevrolet', 'dodge', 'honda', 'isuzu', 'jaguar', 'mazda',
+             'mercedes-benz', 'mercury', 'mitsubishi', 'nissan', 'peugot', 'plymouth', 'porsche',
+             'renault', 'saab', 'subaru', 'toyota', 'volkswagen', 'volvo'],
+    'fuel-type': ['diesel', 'gas'],
+    'aspiration': ['std', 'turbo'],
+    'num-of-doors': ['four', 'two'],
+    'body-style': ['convertible', 'hardtop', 'hatchback', 'sedan', 'wagon'],
+    'drive-wheels': ['4wd', 'fwd', 'rwd'],
+    'engine-location': ['front', 'rear'],
+    'engine-type': ['dohc', 'dohcv', 'l', 'ohc', 'ohcf', 'ohcv', 'rotor'],
+    'num-of-cylinders': ['eight', 'five', 'four', 'six', 'three', 'twelve', 'two'],
+    'fuel-system': ['1bbl', '2bbl', '4bbl', 'idi', 'mfi', 'mpfi', 'spdi', 'spfi']
+}
+
+CATEGORICAL_COLUMNS = [column for column in COLUMN_NAMES if column in CATEGORIES]
+NUMERIC_COLUMNS = [column for column in COLUMN_NAMES if column not in CATEGORIES]
+
+MISSING_VALUE = '?'
+ENGINES = ('c', 'pyarrow')
+DEFAULT_CHUNK_SIZE = 1_000_000  # Rows per chunk
+# pyarrow has no skipinitialspace and matches null values exactly, so '?' and
+# empty fields are also listed with up to this many leading spaces
+MAX_LEADING_SPACES = 8
+# Bytes parsed per pyarrow block. The streaming reader keeps many blocks in
+# flight, so its memory grows with the block size, not with the chunk size.
+ARROW_BLOCK_SIZE = 1 << 20
+
+
+def imports85_dtypes(float_dtype='float32'):
+    """
+    Returns the dtype of every column: float_dtype for numbers and a
+    CategoricalDtype with the fixed vocabulary for categorical columns.
+    """
+    dtypes = {column: float_dtype for column in NUMERIC_COLUMNS}
+    dtypes.update({column: pd.CategoricalDtype(categories) for column, categories in CATEGORIES.items()})
+    return dtypes
+
+
+def _check_engine(engine):
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got '{engine}'")
+
+
+def _report_unknown(df, unknown):
+    """
+    Record the counts of categorical values outside the vocabulary in
+    df.attrs['unknown_categories'] and warn about them, since they are read
+    as missing.
+    """
+    df.attrs['unknown_categories'] = unknown
+    if unknown:
+        details = '; '.join(f"{column}: {sum(counts.values())} ({', '.join(map(repr, list(counts)[:5]))})"
+                            for column, counts in unknown.items())
+        warnings.warn(f"Values outside the category vocabulary were read as missing: {details}", stacklevel=3)
+    return df
+
+
+def _apply_vocabulary(df):
+    """
+    Recode categoricals read with inferred categories onto the fixed
+    vocabulary, counting the values outside it.
+    """
+    unknown = {}
+    for column, categories in CATEGORIES.items():
+        counts = df[column].value_counts(sort=False)
+        outside = counts[~counts.index.isin(categories) & (counts > 0)]
+        if len(outside):
+            unknown[column] = {str(value): int(count) for value, count in outside.items()}
+        df[column] = df[column].cat.set_categories(categories)
+    return _report_unknown(df, unknown)
+
+
+def _read_c(filepath, float_dtype, **kwargs):
+    # Categories are inferred while parsing and mapped onto the vocabulary
+    # afterwards, so values outside it can be counted
+    dtypes = {column: float_dtype for column in NUMERIC_COLUMNS}
+    dtypes.update({column: 'category' for column in CATEGORICAL_COLUMNS})
+    return pd.read_csv(filepath, names=COLUMN_NAMES, dtype=dtypes, na_values=MISSING_VALUE,
+                       skipinitialspace=True, engine='c', **kwargs)
+
+
+def _arrow_options(float_dtype):
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pv
+    except ImportError as e:
+        raise ImportError("engine='pyarrow' requires pyarrow: pip install pyarrow") from e
+
+    read_options = pv.ReadOptions(column_names=COLUMN_NAMES, block_size=ARROW_BLOCK_SIZE)
+    # Numbers are parsed with surrounding whitespace. Categorical columns are
+    # dictionary encoded while parsing; the dictionaries are stripped and
+    # mapped onto the fixed vocabulary afterwards.
+    column_types = {column: pa.from_numpy_dtype(np.dtype(float_dtype)) for column in NUMERIC_COLUMNS}
+    column_types.update({column: pa.dictionary(pa.int32(), pa.string()) for column in CATEGORICAL_COLUMNS})
+    null_values = [' ' * spaces + token for spaces in range(MAX_LEADING_SPACES + 1) for token in (MISSING_VALUE, '')]
+    convert_options = pv.ConvertOptions(column_types=column_types, null_values=null_values,
+                                        strings_can_be_null=True)
+    return read_options, convert_options
+
+
+def _strip(values):
+    # Leading whitespace only, as skipinitialspace; a stripped MISSING_VALUE or
+    # empty string becomes null
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    values = pc.utf8_ltrim_whitespace(values)
+    return pc.if_else(pc.is_in(values, pa.array([MISSING_VALUE, ''])), pa.scalar(None, values.type), values)
+
+
+def _vocabulary_codes(chunks, categories, unknown):
+    """
+    Map dictionary-encoded pyarrow chunks onto category codes of the vocabulary;
+    missing values and values outside it get code -1. Occurrences of values
+    outside the vocabulary are added to `unknown`.
+    """
+    vocabulary = pd.Index(categories)
+    codes = []
+    for chunk in chunks:
+        dictionary = _strip(chunk.dictionary).to_pandas()
+        # Position of each dictionary entry in the vocabulary, -1 appended for nulls
+        positions = np.append(vocabulary.get_indexer(dictionary), -1)
+        indices = chunk.indices.fill_null(len(dictionary)).to_numpy()
+        codes.append(positions[indices])
+        counts = np.bincount(indices, minlength=len(dictionary) + 1)[:-1]
+        outside = (positions[:-1] < 0) & (counts > 0) & dictionary.notna().to_numpy()
+        for value, count in zip(dictionary[outside], counts[outside]):
+            unknown[value] = unknown.get(value, 0) + int(count)
+    return np.concatenate(codes) if codes else np.empty(0, dtype=np.intp)
+
+
+def _arrow_to_frame(table, float_dtype):
+    """
+    Convert a pyarrow Table or RecordBatch into a DataFrame with the schema's dtypes.
+    """
+    data, unknown = {}, {}
+    for column in COLUMN_NAMES:
+        values = table.column(column)
+        chunks = values.chunks if hasattr(values, 'chunks') else [values]
+        if column in CATEGORIES:
+            dtype = pd.CategoricalDtype(CATEGORIES[column])
+            column_unknown = {}
+            data[column] = pd.Categorical.from_codes(_vocabulary_codes(chunks, CATEGORIES[column], column_unknown),
+                                                     dtype=dtype)
+            if column_unknown:
+                unknown[column] = column_unknown
+        else:
+            # Nulls become NaN
+            data[column] = np.concatenate([chunk.to_numpy(zero_copy_only=False) for chunk in chunks]
+                                          or [np.empty(0)]).astype(float_dtype, copy=False)
+    return _report_unknown(pd.DataFrame(data, copy=False), unknown)
+
+
+def read_imports85(filepath, engine='c', float_dtype='float32'):
+    """
+    Reads an imports-85-format file into its final dtypes in one pass.
+
+    '?' marks missing values and leading whitespace is skipped (with pyarrow,
+    up to MAX_LEADING_SPACES before a '?'). Categorical values outside the fixed vocabulary are read as
+    missing; they are counted per column in df.attrs['unknown_categories']
+    and reported with a warning.
+
+    Parameters:
+    - filepath (str): Path to the comma-separated file without header.
+    - engine (str): 'c' (pandas' C parser) or 'pyarrow' (multithreaded, requires pyarrow).
+    - float_dtype (str): Dtype of the numerical columns.
+
+    Returns:
+    - pd.DataFrame: The data, with the columns of COLUMN_NAMES.
+    """
+    _check_engine(engine)
+    if engine == 'pyarrow':
+        read_options, convert_options = _arrow_options(float_dtype)
+        import pyarrow.csv as pv
+        table = pv.read_csv(filepath, read_options=read_options, convert_options=convert_options)
+        return _arrow_to_frame(table, float_dtype)
+    return _apply_vocabulary(_read_c(filepath, float_dtype))
+
+
+def iter_imports85(filepath, chunksize=DEFAULT_CHUNK_SIZE, engine='c', float_dtype='float32'):
+    """
+    Reads an imports-85-format file in chunks, so only one chunk is held in memory.
+
+    Every chunk has the same dtypes, including the full category vocabulary,
+    so chunks can be concatenated or scored without realigning them.
+
+    Parameters:
+    - filepath (str): Path to the comma-separated file without header.
+    - chunksize (int): Rows per chunk (the last chunk may be shorter).
+    - engine (str): 'c' or 'pyarrow'.
+    - float_dtype (str): Dtype of the numerical columns.
+
+    Returns:
+    - Iterator over DataFrame chunks.
+    """
+    _check_engine(engine)
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be positive, got {chunksize}")
+
+    if engine == 'pyarrow':
+        read_options, convert_options = _arrow_options(float_dtype)
+        import pyarrow as pa
+        import pyarrow.csv as pv
+        # Regroup the reader's small record batches into chunks of chunksize rows;
+        # slicing and regrouping tables does not copy data
+        pending, pending_rows = [], 0
+        for batch in pv.open_csv(filepath, read_options=read_options, convert_options=convert_options):
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            while pending_rows >= chunksize:
+                table = pa.Table.from_batches(pending)
+                yield _arrow_to_frame(table.slice(0, chunksize), float_dtype)
+                rest = table.slice(chunksize)
+                pending, pending_rows = rest.to_batches(), rest.num_rows
+        if pending_rows:
+            yield _arrow_to_frame(pa.Table.from_batches(pending), float_dtype)
+        return
+
+    with _read_c(filepath, float_dtype, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield _apply_vocabulary(chunk)
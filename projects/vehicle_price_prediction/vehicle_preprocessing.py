@@ -0,0 +1,166 @@
+# vehicle_preprocessing.py
+#
+# Preprocessing shared by training (vehicle_price_prediction.py) and inference
+# (inference.py). It is fitted once on the training data and saved as a single
+# artifact. It turns a whole batch of raw vehicle records into the model's
+# feature matrix in one vectorized step.
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.preprocessing import LabelEncoder
+
+TARGET_COLUMN = 'price'
+
+# Two-valued columns, label encoded to 0/1
+BINARY_COLUMNS = ['fuel-type', 'aspiration', 'engine-location', 'num-of-doors']
+
+# Multi-class columns, one-hot encoded with the first category dropped
+ONE_HOT_COLUMNS = ['make', 'body-style', 'drive-wheels', 'engine-type', 'num-of-cylinders', 'fuel-system']
+
+# Tolerance of the lsqr solver LinearRegression uses on sparse input (its tol,
+# scikit-learn >= 1.7). The default of 1e-6 leaves predictions a few dollars
+# off the exact dense solution; 1e-10 keeps them within a cent on the catalogues
+# of benchmarks/bench_sparse.py. On imports-85.data itself, whose training
+# matrix is rank deficient, they stay up to $0.36 apart at any tolerance.
+SPARSE_TOL = 1e-10
+
+
+def imputation_statistics(df, numeric_columns, categorical_columns):
+    """
+    Computes the fill value of every column: the mean of numerical columns and
+    the mode of categorical columns.
+
+    Parameters:
+    - df (pd.DataFrame): Training data.
+    - numeric_columns (list): Columns filled with their mean.
+    - categorical_columns (list): Columns filled with their most frequent value.
+
+    Returns:
+    - dict: Fill value per column, usable with DataFrame.fillna.
+    """
+    fill_values = df[numeric_columns].mean().to_dict()
+    fill_values.update(df[categorical_columns].mode().iloc[0].to_dict())
+    return fill_values
+
+
+class VehiclePreprocessor:
+    """
+    Fitted preprocessing for the vehicle price model.
+
+    Holds the imputation values, the LabelEncoders of the binary columns and
+    the one-hot vocabulary of the multi-class columns, together with the
+    position of every output column in the model matrix. The output matches
+    LabelEncoder plus pd.get_dummies(drop_first=True) on the training data,
+    column for column, as a dense DataFrame or a CSR matrix.
+    """
+
+    def __init__(self, fill_values=None, sparse_output=False):
+        """
+        Parameters:
+        - fill_values (dict): Value per column used to fill missing inputs, as
+          returned by imputation_statistics on the training data.
+        - sparse_output (bool): Produce CSR matrices instead of DataFrames. With
+          thousands of makes the one-hot block is almost all zeros, and
+          LinearRegression fits CSR input directly.
+        """
+        fill_values = {} if fill_values is None else fill_values
+        self.fill_values = {column: value for column, value in fill_values.items() if column != TARGET_COLUMN}
+        self.sparse_output = sparse_output
+
+    def fit(self, df):
+        """
+        Learn the encoders and the feature layout from the preprocessed training data.
+
+        Parameters:
+        - df (pd.DataFrame): Training data after imputation, before encoding.
+
+        Returns:
+        - VehiclePreprocessor: The fitted preprocessor.
+        """
+        self.raw_columns = [column for column in df.columns if column != TARGET_COLUMN]
+        self.label_encoders = {column: LabelEncoder().fit(df[column]) for column in BINARY_COLUMNS}
+        # All categories of the category dtype, as pd.get_dummies uses them
+        self.vocabulary = {column: list(df[column].astype('category').cat.categories)
+                           for column in ONE_HOT_COLUMNS}
+
+        # Same order as pd.get_dummies: remaining columns first, then the dummies
+        self.dense_columns = [column for column in self.raw_columns if column not in ONE_HOT_COLUMNS]
+        self.feature_names = self.dense_columns + [
+            f"{column}_{category}" for column in ONE_HOT_COLUMNS for category in self.vocabulary[column][1:]
+        ]
+        position = {name: i for i, name in enumerate(self.feature_names)}
+        # Output column per category code; the dropped first category and unknown
+        # values (code -1, looked up as the last entry) have no column
+        self.dummy_positions = {
+            column: np.array([-1] + [position[f"{column}_{category}"] for category in categories[1:]] + [-1])
+            for column, categories in self.vocabulary.items()
+        }
+        return self
+
+    def _encode(self, data):
+        """
+        Fill and encode a batch: returns the dense block (numerical and binary
+        columns, in feature order) and the row and column index of every 1 in
+        the one-hot block.
+        """
+        if isinstance(data, dict):
+            data = [data]
+        df = pd.DataFrame(data).reindex(columns=self.raw_columns)
+        # Unparseable numbers count as missing, so they are filled as well
+        numeric = [column for column in self.dense_columns if column not in BINARY_COLUMNS]
+        df[numeric] = df[numeric].apply(pd.to_numeric, errors='coerce')
+        df = df.fillna(self.fill_values)
+
+        dense = np.empty((len(df), len(self.dense_columns)))
+        dense[:, [self.dense_columns.index(column) for column in numeric]] = df[numeric].to_numpy(dtype=np.float64)
+
+        for column, encoder in self.label_encoders.items():
+            codes = pd.Categorical(df[column], categories=encoder.classes_).codes
+            if (codes < 0).any():
+                unknown = sorted(set(df[column][codes < 0].astype(str)))
+                raise ValueError(f"Column '{column}' contains unknown values {unknown}; "
+                                 f"expected one of {list(encoder.classes_)}")
+            dense[:, self.dense_columns.index(column)] = codes
+
+        rows, positions = [], []
+        row_numbers = np.arange(len(df))
+        for column, categories in self.vocabulary.items():
+            codes = pd.Categorical(df[column], categories=categories).codes
+            column_positions = self.dummy_positions[column][codes]
+            hit = column_positions >= 0
+            rows.append(row_numbers[hit])
+            positions.append(column_positions[hit])
+        return df.index, dense, np.concatenate(rows), np.concatenate(positions)
+
+    def transform(self, data, sparse_output=None):
+        """
+        Convert a batch of raw vehicle records into the model's feature matrix.
+
+        Missing columns and values are filled with the fill values. Unknown
+        categories of one-hot columns encode as all zeros; unknown values of
+        binary columns raise a ValueError.
+
+        Parameters:
+        - data (pd.DataFrame, dict or list of dicts): Raw vehicle records.
+        - sparse_output (bool): Return a CSR matrix instead of a DataFrame.
+          Defaults to the setting the preprocessor was created with.
+
+        Returns:
+        - pd.DataFrame or scipy.sparse.csr_matrix: Feature matrix with the model's
+          columns, in the input's row order.
+        """
+        sparse_output = self.sparse_output if sparse_output is None else sparse_output
+        index, dense, rows, positions = self._encode(data)
+        n_rows, n_dense = dense.shape
+
+        if sparse_output:
+            # The dense columns come first, so the one-hot block is appended to them
+            one_hot = sp.csr_matrix((np.ones(len(rows)), (rows, positions - n_dense)),
+                                    shape=(n_rows, len(self.feature_names) - n_dense))
+            return sp.hstack([sp.csr_matrix(dense), one_hot], format='csr')
+
+        matrix = np.zeros((n_rows, len(self.feature_names)))
+        matrix[:, :n_dense] = dense
+        matrix[rows, positions] = 1.0
+        return pd.DataFrame(matrix, columns=self.feature_names, index=index)
@@ -4,10 +4,13 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import joblib  # Import joblib for model serialization
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
 from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import MaxAbsScaler
 from sklearn.metrics import mean_squared_error, r2_score
 import os
+from vehicle_data import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS, read_imports85
+from vehicle_preprocessing import SPARSE_TOL, VehiclePreprocessor, imputation_statistics
 
 # Suppress SettingWithCopyWarning for cleaner output
 pd.options.mode.chained_assignment = None
@@ -15,25 +18,15 @@ pd.options.mode.chained_assignment = None
 # Define the local path to the dataset
 file_path = 'imports-85.data'  # Ensure this file is in the current working directory
 
-# Define column names as per the dataset documentation
-column_names = [
-    'symboling', 'normalized-losses', 'make', 'fuel-type', 'aspiration',
-    'num-of-doors', 'body-style', 'drive-wheels', 'engine-location',
-    'wheel-base', 'length', 'width', 'height', 'curb-weight',
-    'engine-type', 'num-of-cylinders', 'engine-size', 'fuel-system',
-    'bore', 'stroke', 'compression-ratio', 'horsepower', 'peak-rpm',
-    'city-mpg', 'highway-mpg', 'price'
-]
-
-# Read the dataset into a Pandas DataFrame
+# Encode features as a CSR sparse matrix instead of a dense DataFrame. Worth it for
+# large catalogues (thousands of makes), where the one-hot block is almost all zeros.
+# The setting is stored in the preprocessing artifact, so inference follows it.
+sparse_features = False
+
+# Read the dataset into a Pandas DataFrame, parsed in one pass into the schema's
+# dtypes: float32 numbers and categoricals with the documented vocabulary ('?' is NaN)
 try:
-    df = pd.read_csv(
-        file_path,
-        names=column_names,
-        na_values='?',      # Interpret '?' as NaN
-        sep=',',            # Comma as delimiter
-        skipinitialspace=True
-    )
+    df = read_imports85(file_path)
     print("Dataset successfully loaded.")
 except FileNotFoundError:
     print(f"Error: The file '{file_path}' was not found. Please ensure the file exists in the specified path.")
@@ -50,30 +43,12 @@ print(df.info())
 
 # Data Preprocessing
 
-# Define numerical and categorical columns
-numeric_columns = [
-    'symboling', 'normalized-losses', 'wheel-base', 'length', 'width',
-    'height', 'curb-weight', 'engine-size', 'bore', 'stroke',
-    'compression-ratio', 'horsepower', 'peak-rpm', 'city-mpg',
-    'highway-mpg', 'price'
-]
-
-categorical_columns = [
-    'make', 'fuel-type', 'aspiration', 'num-of-doors', 'body-style',
-    'drive-wheels', 'engine-location', 'engine-type',
-    'num-of-cylinders', 'fuel-system'
-]
-
-# Convert numeric columns to appropriate data types
-for column in numeric_columns:
-    df[column] = pd.to_numeric(df[column], errors='coerce')
-
-# Convert categorical columns to 'category' dtype
-for column in categorical_columns:
-    df[column] = df[column].astype('category')
-
-# Display data types after conversion
-print("\nData Types After Conversion:")
+# Numerical and categorical columns, as declared in the schema
+numeric_columns = NUMERIC_COLUMNS
+categorical_columns = CATEGORICAL_COLUMNS
+
+# Display data types (already final, the reader parses into them)
+print("\nData Types:")
 print(df.dtypes)
 
 # Handling Missing Values
@@ -83,19 +58,18 @@ missing_data = df.isnull().sum()
 print("\nMissing Values per Column:")
 print(missing_data)
 
-# Impute missing values for numerical columns with mean
-for column in numeric_columns:
-    if df[column].isnull().sum() > 0:
-        mean_value = df[column].mean()
-        df[column] = df[column].fillna(mean_value)  # Explicit assignment
-        print(f"Imputed missing values in '{column}' with mean value {mean_value:.2f}")
+# Fill statistics of every column (mean for numerical, mode for categorical columns),
+# computed on the training data and kept in the preprocessing artifact for inference
+fill_values = imputation_statistics(df, numeric_columns, categorical_columns)
 
-# Impute missing values for categorical columns with mode
-for column in categorical_columns:
-    if df[column].isnull().sum() > 0:
-        mode_value = df[column].mode()[0]
-        df[column] = df[column].fillna(mode_value)  # Explicit assignment
-        print(f"Imputed missing values in '{column}' with mode value '{mode_value}'")
+for column in missing_data[missing_data > 0].index:
+    if column in numeric_columns:
+        print(f"Imputed missing values in '{column}' with mean value {fill_values[column]:.2f}")
+    else:
+        print(f"Imputed missing values in '{column}' with mode value '{fill_values[column]}'")
+
+# Impute all missing values in one step
+df = df.fillna(fill_values)
 
 # Drop rows where 'price' is missing
 initial_row_count = df.shape[0]
@@ -133,44 +107,34 @@ else:
 
 # Encoding Categorical Variables
 
-# Initialize separate LabelEncoders for each binary categorical variable
-label_encoders = {}
-binary_columns = ['fuel-type', 'aspiration', 'engine-location', 'num-of-doors']
-
-for col in binary_columns:
-    le = LabelEncoder()
-    df[col] = le.fit_transform(df[col])
-    label_encoders[col] = le
-    print(f"Encoded binary column '{col}' with LabelEncoder.")
+# Fit the preprocessing artifact: LabelEncoders for the binary columns, the one-hot
+# vocabulary of the multi-class columns and the imputation values. The same
+# artifact encodes the data for inference.
+preprocessor = VehiclePreprocessor(fill_values, sparse_output=sparse_features).fit(df)
+print(f"Encoded binary columns {list(preprocessor.label_encoders)} with LabelEncoder.")
 
-# Save each LabelEncoder separately
+# Save the preprocessing artifact
 model_dir = 'models'
 if not os.path.exists(model_dir):
     os.makedirs(model_dir)
 
-for col, le in label_encoders.items():
-    encoder_path = os.path.join(model_dir, f'label_encoder_{col}.joblib')
-    joblib.dump(le, encoder_path)
-    print(f"LabelEncoder for '{col}' saved at '{encoder_path}'.")
-
-# One-Hot Encoding for Multi-Class Categorical Variables
-df = pd.get_dummies(
-    df,
-    columns=['make', 'body-style', 'drive-wheels', 
-             'engine-type', 'num-of-cylinders', 'fuel-system'],
-    drop_first=True
-)
-print("Applied One-Hot Encoding to multi-class categorical variables.")
+preprocessor_path = os.path.join(model_dir, 'vehicle_preprocessor.joblib')
+joblib.dump(preprocessor, preprocessor_path)
+print(f"Preprocessing artifact saved at '{preprocessor_path}'.")
 
-# Feature Selection
-features = df.drop(['price'], axis=1)
+# Feature Selection (one-hot encodes the multi-class columns)
+features = preprocessor.transform(df)
 target = df['price']
+print("Applied One-Hot Encoding to multi-class categorical variables.")
 
 # Exploratory Data Analysis
 
-# Correlation Matrix
+# Correlation Matrix (computed once; the feature heatmap is the matrix without 'price')
+feature_frame = (pd.DataFrame.sparse.from_spmatrix(features, index=df.index, columns=preprocessor.feature_names)
+                 if sparse_features else features)
+correlation = feature_frame.assign(price=target).corr()
 plt.figure(figsize=(20, 20))
-sns.heatmap(features.corr(), annot=False, cmap='coolwarm')
+sns.heatmap(correlation.drop(index='price', columns='price'), annot=False, cmap='coolwarm')
 plt.title('Correlation Matrix')
 plt.show()
 
@@ -182,7 +146,6 @@ plt.ylabel('Frequency')
 plt.show()
 
 # Top Correlated Features with Price
-correlation = df.corr()
 top_features = correlation['price'].abs().sort_values(ascending=False).head(10)
 print("\nTop Correlated Features with Price:")
 print(top_features)
@@ -195,7 +158,10 @@ X_train, X_test, y_train, y_test = train_test_split(
 )
 
 # Model Training
-model = LinearRegression()
+# LinearRegression solves sparse input iteratively (lsqr), which only converges on
+# comparably scaled columns; MaxAbsScaler scales them without densifying the matrix
+model = (make_pipeline(MaxAbsScaler(), LinearRegression(tol=SPARSE_TOL)) if sparse_features
+         else LinearRegression())
 model.fit(X_train, y_train)
 print("\nModel training completed.")
 